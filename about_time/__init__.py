@@ -1,23 +1,85 @@
-from importlib import metadata
-
-from .core import about_time
-from .features import FEATURES
-from .human_count import HumanCount
-from .human_duration import HumanDuration
-from .human_throughput import HumanThroughput
-
-try:
-    pkg_metadata = metadata.metadata('about-time')
-    __version__ = pkg_metadata['Version']
-    __author__ = pkg_metadata['Author-Email']
-    __email__ = __author__.split('<')[1][:-1]  # simple parser for "Name <email@addr.com>".
-except metadata.PackageNotFoundError:  # pragma: no cover
-    # the package is not installed, so we can't get the metadata; common during development.
-    __version__ = '0.0.0'
-    __author__ = None
-    __email__ = None
-
-VERSION = tuple(map(int, __version__.split('.')))
+from .core import about_time, nbytes
+
+# everything else is only imported when first used, to keep the import of this package fast.
+_LAZY = {
+    'Comparison': 'runner',
+    'Exporter': 'exporter',
+    'FEATURES': 'features',
+    'Histogram': 'histogram',
+    'HumanCount': 'human_count',
+    'HumanDuration': 'human_duration',
+    'HumanThroughput': 'human_throughput',
+    'IEC': 'features',
+    'PrometheusFile': 'exporter',
+    'RepeatStats': 'runner',
+    'Reporter': 'reporter',
+    'SampledStats': 'sampling',
+    'SharedStats': 'shared',
+    'SpanStats': 'tracing',
+    'StatsD': 'exporter',
+    'TimedIO': 'stream',
+    'Timer': 'timers',
+    'calibrate': 'calibration',
+    'compare': 'runner',
+    'collapsed_spans': 'tracing',
+    'overhead_ns': 'calibration',
+    'parse_count': 'human_count',
+    'parse_duration': 'human_duration',
+    'parse_throughput': 'human_throughput',
+    'report_spans': 'tracing',
+    'report_timers': 'timers',
+    'reset_spans': 'tracing',
+    'repeat': 'runner',
+    'span': 'tracing',
+    'spans': 'tracing',
+    'timed': 'sampling',
+    'timed_io': 'stream',
+    'timer': 'timers',
+}
+_METADATA = ('__version__', '__author__', '__email__', 'VERSION')
+
+
+def __getattr__(name):
+    if name in _METADATA:
+        globals().update(_metadata())
+    elif name in _LAZY:
+        from importlib import import_module
+        globals()[name] = getattr(import_module('.' + _LAZY[name], __name__), name)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | set(_METADATA))
+
+
+def _metadata():
+    # scanning the installed distributions can be slow in large environments.
+    from importlib import metadata
+
+    try:
+        pkg_metadata = metadata.metadata('about-time')
+        version = pkg_metadata['Version']
+        author = pkg_metadata['Author-Email']
+        email = author.split('<')[1][:-1]  # simple parser for "Name <email@addr.com>".
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        # the package is not installed, so we can't get the metadata; common during development.
+        version, author, email = '0.0.0', None, None
+
+    return {
+        '__version__': version,
+        '__author__': author,
+        '__email__': email,
+        'VERSION': tuple(map(int, version.split('.'))),
+    }
+
 
 __all__ = ('__author__', '__version__', 'about_time', 'HumanCount', 'HumanDuration',
-           'HumanThroughput', 'FEATURES')
+           'HumanThroughput', 'FEATURES', 'Histogram', 'timer', 'Timer', 'report_timers',
+           'SharedStats', 'timed', 'SampledStats', 'span', 'SpanStats', 'report_spans',
+           'collapsed_spans', 'Exporter', 'PrometheusFile', 'StatsD', 'calibrate',
+           'overhead_ns', 'IEC', 'repeat', 'RepeatStats', 'compare', 'Comparison',
+           'parse_count', 'parse_duration', 'parse_throughput', 'nbytes',
+           'timed_io', 'TimedIO', 'Reporter',
+           'spans', 'reset_spans')
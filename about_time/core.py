@@ -1,25 +1,55 @@
 from __future__ import annotations
 
 import time
-from contextlib import AbstractContextManager, contextmanager
-from typing import Callable, Generic, Iterable, TypeVar, overload
+from itertools import chain, compress, count
+from types import CoroutineType
 
-from .human_count import HumanCount
-from .human_duration import HumanDuration
-from .human_throughput import HumanThroughput
+# this module is imported with the package, so it should not import anything heavy at
+# runtime, like `typing`; the human and histogram modules are imported when first used.
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import AsyncIterable, Awaitable, Callable, Generic, Iterable, TypeVar, overload
 
-T = TypeVar("T")
+    from .histogram import Histogram
+    from .human_count import HumanCount
+    from .memory import MemoryStats
+    from .rate import RecentRate
+    from .human_duration import HumanDuration
+    from .human_throughput import HumanThroughput
 
+    T = TypeVar("T")
 
+    class _GenericResult(Generic[T]):
+        pass
+else:
+    T = None
+
+    class _GenericResult(object):
+        __slots__ = ()
+
+        def __class_getitem__(cls, _item):  # allows `HandleResult[int]` at runtime.
+            return cls
+
+    def overload(func):  # the stubs below are only for type checkers, hence the noqa.
+        return func
+
+
+@overload
+def about_time(func: Callable[..., Awaitable[T]], /, *args,
+               **kwargs) -> Awaitable[HandleResult[T]]: ...
 @overload
-def about_time(func: Callable[..., T], *args, **kwargs) -> "HandleResult[T]": ...
+def about_time(func: Callable[..., T], /, *args, **kwargs) -> HandleResult[T]: ...  # noqa: F811
 @overload
-def about_time(it: Iterable[T]) -> "HandleStats": ...
+def about_time(it: Iterable[T] | AsyncIterable[T], /, *, batched: bool = False,  # noqa: F811
+               weight: Callable[[T], int] | None = None, histogram: bool = False,
+               window: float = 5., total: int | None = None) -> HandleStats: ...
 @overload
-def about_time() -> "AbstractContextManager[Handle]": ...
+def about_time(*, clock: str = 'perf', cpu: str | bool | None = None,  # noqa: F811
+               compensate: bool = False, memory: bool | int = False) -> _Timing: ...
 
 
-def about_time(func_or_it: Callable[..., T] | Iterable[T] | None = None, *args, **kwargs):
+def about_time(func_or_it: Callable[..., T] | Iterable[T] | AsyncIterable[T] | None = None,  # noqa: F811
+               /, *args, **kwargs):
     """Measure timing and throughput of code blocks, with beautiful
     human friendly representations.
 
@@ -41,45 +71,221 @@ def about_time(func_or_it: Callable[..., T] | Iterable[T] | None = None, *args,
     >>> t = about_time(it)  # any iterable or generator.
     >>> for item in t:
     ....    # use item
-    """
 
-    timings = [0.0, 0.0]
+    If each element is a batch of items, e.g. chunks or lists, use
+    `batched=True` to count `len(batch)` items per element, or send
+    `weight=` a function to count whatever it returns per element, e.g.
+    `weight=nbytes` to count the bytes of buffers, and get them in IEC
+    units in `t.count_bytes_human` and `t.throughput_bytes_human`.
+    Use `histogram=True` to also record the time between consecutive
+    elements, and get their percentiles in `t.histogram`.
+    The recent throughput in `t.throughput_recent` fades the older
+    history away with a time constant of `window` seconds, 5 by default,
+    as long as it is read periodically.
+    If the iterable is sized, or `total=` is sent, `t.remaining`,
+    `t.percent` and `t.eta` estimate the work left, from that recent
+    throughput.
+
+    The context manager measures with `time.perf_counter_ns` by default,
+    send `clock=` to use another clock, see `CLOCKS`. Send `cpu=True`
+    (or the name of a CPU clock) to also measure the CPU time, in
+    `t.cpu_time`, and get `t.cpu_ratio`, its ratio to the duration.
+    For tiny blocks, send `compensate=True` to subtract the calibrated
+    overhead of the measuring itself from the duration, see `calibrate`.
+    Send `memory=True` to trace the memory allocated in `t.memory`, or a
+    number to also record that many top allocation sites. With options,
+    the handle also times callables, e.g. `about_time(cpu=True)(func, 1)`.
+
+    All modes also work with asyncio, without blocking the event loop:
+
+    >>> async with about_time() as t:
+    ....    # code block.
+    >>> t = await about_time(coro_func, 1, b=2)  # coroutine functions.
+    >>> t = about_time(async_it)  # async iterables or generators.
+    >>> async for item in t:
+    ....    # use item
+    """
 
     # use as a context manager.
     if func_or_it is None:
-        return _context_timing(timings, Handle(timings))
+        return _ClockTiming(**kwargs) if kwargs else _Timing((0, 0))
 
     # use as a callable.
     if callable(func_or_it):
-        with _context_timing(timings):
-            result = func_or_it(*args, **kwargs)
-        return HandleResult(timings, result)
+        start = time.perf_counter_ns()
+        result = func_or_it(*args, **kwargs)
+        if type(result) is CoroutineType:
+            return _await_result(start, result)
+        return HandleResult((start, time.perf_counter_ns()), result)
 
     try:
         it = iter(func_or_it)
     except TypeError:
-        raise UserWarning('param should be callable or iterable.')
+        if not hasattr(func_or_it, '__aiter__'):
+            raise UserWarning('param should be callable or iterable.')
+        it = func_or_it.__aiter__()  # use as a counter/throughput async iterator.
 
     # use as a counter/throughput iterator.
-    def it_closure():
-        with _context_timing(timings):
-            for it_closure.count, elem in enumerate(it, 1):  # iterators are iterable.
-                yield elem
+    return _handle_stats(it, func_or_it, **kwargs)
+
+
+def _handle_stats(it, source, batched=False, weight=None, histogram=False, window=5.,
+                  total=None):
+    if batched and weight is None:
+        weight = len
+    if total is None and weight is None and hasattr(source, '__len__'):
+        try:
+            total = len(source)  # the length of weighted elements does not count the items.
+        except (TypeError, OverflowError):  # e.g. huge ranges, or lengths not really there.
+            pass
+    if histogram:
+        from .histogram import Histogram
+        histogram = Histogram()
+    else:
+        histogram = None
+    if hasattr(it, '__anext__'):
+        counter = _AsyncStepCounter(it, weight, histogram)
+    elif weight or histogram:
+        counter = _StepCounter(it, weight, histogram)
+    else:
+        counter = _ItemCounter(it)
+    return HandleStats((0, 0), counter, histogram, window, total)
+
+
+async def _await_result(start, coro):
+    result = await coro
+    return HandleResult((start, time.perf_counter_ns()), result)
+
+
+class _ItemCounter(object):
+    """Iterator factory which counts elements without running any python code per item.
+
+    The elements are filtered by an `itertools.count(1)` as selectors, which are always
+    truthy, so both the iteration and the counting happen in C. The timer is started and
+    stopped by two empty generators chained around it, which only run on the first
+    element and on exhaustion.
+    """
+
+    __slots__ = ('__it', '__counter')
+
+    def __init__(self, it):
+        self.__it = it
+        self.__counter = count(1)
+
+    def __call__(self, handle):
+        self.__counter = count(1)  # the count restarts when iterating again.
+        return chain(_start(handle), compress(self.__it, self.__counter), _stop(handle))
+
+    @property
+    def count(self) -> int:
+        # `itertools.count` does not expose its state, but its repr does: "count(n)".
+        # since `compress` only advances it after the source produced an element, `n` is
+        # always the number of elements yielded so far plus one.
+        return int(repr(self.__counter)[6:-1]) - 1
+
 
-    it_closure.count = 0  # the count will only be updated after starting iterating.
-    return HandleStats(timings, it_closure)
+def nbytes(buffer) -> int:
+    """Return the size in bytes of a buffer, without copying it, to send as the weight
+    of streams of chunks, e.g. `about_time(chunks, weight=nbytes)`.
 
+    Unlike `len`, it counts bytes for any object with the buffer protocol, like
+    memoryviews and arrays of larger items.
 
-@contextmanager
-def _context_timing(timings, handle=None):
-    timings[0] = time.perf_counter()
-    yield handle
-    timings[1] = time.perf_counter()
+    Args:
+        buffer: the bytes, bytearray, memoryview, array, etc.
+
+    Returns:
+        the number of bytes.
+
+    """
+    if type(buffer) is bytes or type(buffer) is bytearray:  # the most common, faster.
+        return len(buffer)
+    with memoryview(buffer) as view:
+        return view.nbytes
+
+
+def _start(handle):
+    handle._start = time.perf_counter_ns()
+    yield from ()
+
+
+def _stop(handle):
+    handle._end = time.perf_counter_ns()
+    yield from ()
+
+
+class _StepCounter(object):
+    """Iterator factory which runs python code per element, for the modes that need it.
+
+    It counts the weight of each element if it has a weight function, e.g. `len` of
+    batches, and records the time between consecutive elements if it has a histogram.
+    """
+
+    __slots__ = ('__it', '__weight', '__histogram', 'count')
+
+    def __init__(self, it, weight, histogram):
+        self.__it = it
+        self.__weight = weight
+        self.__histogram = histogram
+        self.count = 0
+
+    def __call__(self, handle):
+        weight, record = self.__weight, self.__histogram and self.__histogram.record
+        clock = time.perf_counter_ns
+        self.count, last = 0, clock()
+        handle._start = last
+        for elem in self.__it:
+            if record:
+                now = clock()
+                record(now - last)
+                last = now
+            self.count += weight(elem) if weight else 1
+            yield elem
+        handle._end = clock()
+
+
+class _AsyncStepCounter(object):
+    """Async iterator factory, with the same features as `_StepCounter`."""
+
+    __slots__ = ('__it', '__weight', '__histogram', 'count')
+
+    def __init__(self, it, weight, histogram):
+        self.__it = it
+        self.__weight = weight
+        self.__histogram = histogram
+        self.count = 0
+
+    async def __call__(self, handle):
+        weight, record = self.__weight, self.__histogram and self.__histogram.record
+        clock = time.perf_counter_ns
+        self.count, last = 0, clock()
+        handle._start = last
+        async for elem in self.__it:
+            if record:
+                now = clock()
+                record(now - last)
+                last = now
+            self.count += weight(elem) if weight else 1
+            yield elem
+        handle._end = clock()
 
 
 class Handle(object):
+    __slots__ = ('_start', '_end')
+
     def __init__(self, timings):
-        self.__timings = timings
+        self._start, self._end = timings  # inline ints in ns, the end is 0 while running.
+
+    @property
+    def duration_ns(self) -> int:
+        """Return the actual duration in nanoseconds, without any loss of resolution.
+        This is dynamically updated in real time.
+
+        Returns:
+            the number of nanoseconds.
+
+        """
+        return (self._end or time.perf_counter_ns()) - self._start
 
     @property
     def duration(self) -> float:
@@ -90,7 +296,7 @@ class Handle(object):
             the number of seconds.
 
         """
-        return (self.__timings[1] or time.perf_counter()) - self.__timings[0]
+        return self.duration_ns / 1e9
 
     @property
     def duration_human(self) -> HumanDuration:
@@ -101,12 +307,206 @@ class Handle(object):
             the human representation.
 
         """
+        from .human_duration import HumanDuration
         return HumanDuration(self.duration)
 
 
-class HandleResult(Generic[T], Handle):
+class _Timing(Handle):
+    """The handle of the context manager mode, which is its own context manager, both
+    sync and async."""
+    __slots__ = ()
+
+    def __enter__(self) -> Handle:
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_exc):
+        self._end = time.perf_counter_ns()
+
+    async def __aenter__(self) -> Handle:
+        return self.__enter__()
+
+    async def __aexit__(self, *exc):
+        self.__exit__(*exc)
+
+
+CLOCKS = {
+    'perf': 'perf_counter_ns',
+    'monotonic': 'monotonic_ns',
+    'process': 'process_time_ns',  # the CPU time of all threads of the process.
+    'thread': 'thread_time_ns',  # the CPU time of the current thread.
+}
+
+
+def _clock(name: str):
+    try:
+        return getattr(time, CLOCKS[name])
+    except KeyError:
+        raise ValueError('clock should be one of: {}.'.format(', '.join(CLOCKS))) from None
+
+
+class _ClockTiming(_Timing):
+    """The handle of the context manager mode with options, which can also time a
+    callable, with `about_time(**options)(func, *args, **kwargs)`.
+
+    The duration is measured with `clock`, and if `cpu` is sent, the CPU time is also
+    measured with that other clock, `'process'` by default. If `compensate` is sent,
+    the calibrated overhead of the clock is subtracted from the duration. If `memory`
+    is sent, the memory allocated is traced, and if it is a number, that many of the
+    top allocation sites are also recorded.
+    """
+    __slots__ = ('__clock', '__cpu', '_cpu_start', '_cpu_end', '__overhead', '__memory',
+                 '__result')
+
+    def __init__(self, clock: str = 'perf', cpu: str | bool | None = None,
+                 compensate: bool = False, memory: bool | int = False):
+        super(_ClockTiming, self).__init__((0, 0))
+        self.__clock = _clock(clock)
+        self.__cpu = _clock('process' if cpu is True else cpu) if cpu else None
+        self._cpu_start = self._cpu_end = 0
+        self.__overhead = 0
+        self.__result = None
+        if compensate:
+            from .calibration import overhead_ns
+            self.__overhead = overhead_ns(clock)
+        self.__memory = None
+        if memory:
+            from .memory import MemoryStats
+            self.__memory = MemoryStats(0 if memory is True else memory)
+
+    def __enter__(self) -> Handle:
+        if self.__memory:
+            self.__memory.start()
+        if self.__cpu:
+            self._cpu_start = self.__cpu()
+        self._start = self.__clock()
+        return self
+
+    def __exit__(self, *_exc):
+        self._end = self.__clock()
+        if self.__cpu:
+            self._cpu_end = self.__cpu()
+        if self.__memory:
+            self.__memory.stop()
+
+    def __call__(self, func: Callable[..., T], *args, **kwargs):
+        """Time a callable, like `about_time(func, *args, **kwargs)` but with the options.
+
+        Returns:
+            this handle, with the result in `result`, or an awaitable of it if the
+            callable is a coroutine function.
+
+        """
+        self.__enter__()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            self.__exit__()
+            raise
+        if type(result) is CoroutineType:
+            return self.__await(result)
+        self.__exit__()
+        self.__result = result
+        return self
+
+    async def __await(self, coro):
+        try:
+            self.__result = await coro
+        finally:
+            self.__exit__()
+        return self
+
+    @property
+    def result(self):
+        """Return the result of the callable, if one was called.
+
+        Returns:
+            the result of the callable, or None if used as a context manager.
+
+        """
+        return self.__result
+
+    @property
+    def memory(self) -> MemoryStats | None:
+        """Return the memory allocated during the block, available after it ends.
+
+        Returns:
+            the memory statistics, or None if the memory is not traced.
+
+        """
+        return self.__memory
+
+    @property
+    def duration_ns(self) -> int:
+        elapsed = (self._end or self.__clock()) - self._start
+        return max(elapsed - self.__overhead, 0) if self.__overhead else elapsed
+
+    @property
+    def overhead_ns(self) -> int:
+        """Return the overhead subtracted from the duration, 0 if not compensated.
+
+        Returns:
+            the number of nanoseconds.
+
+        """
+        return self.__overhead
+
+    @property
+    def cpu_time_ns(self) -> int | None:
+        """Return the CPU time in nanoseconds.
+        This is dynamically updated in real time.
+
+        Returns:
+            the number of nanoseconds, or None if the CPU time is not measured.
+
+        """
+        if not self.__cpu:
+            return None
+        return (self._cpu_end or self.__cpu()) - self._cpu_start
+
+    @property
+    def cpu_time(self) -> float | None:
+        """Return the CPU time in seconds.
+        This is dynamically updated in real time.
+
+        Returns:
+            the number of seconds, or None if the CPU time is not measured.
+
+        """
+        ns = self.cpu_time_ns
+        return None if ns is None else ns / 1e9
+
+    @property
+    def cpu_time_human(self) -> HumanDuration | None:
+        """Return a beautiful representation of the CPU time.
+
+        Returns:
+            the human representation, or None if the CPU time is not measured.
+
+        """
+        from .human_duration import HumanDuration
+        cpu_time = self.cpu_time
+        return None if cpu_time is None else HumanDuration(cpu_time)
+
+    @property
+    def cpu_ratio(self) -> float | None:
+        """Return the ratio of the CPU time to the duration.
+        Near 1 (or the number of busy threads with the `'process'` clock), the block is
+        CPU-bound; near 0, it is mostly waiting on I/O, locks or the GIL.
+
+        Returns:
+            the ratio, or None if the CPU time is not measured or nothing elapsed.
+
+        """
+        cpu_ns, ns = self.cpu_time_ns, self.duration_ns
+        return cpu_ns / ns if cpu_ns is not None and ns else None
+
+
+class HandleResult(_GenericResult[T], Handle):
+    __slots__ = ('__result',)
+
     def __init__(self, timings, result: T):
-        super(HandleResult, self).__init__(timings)
+        self._start, self._end = timings  # inlined super().__init__, which is hot.
         self.__result = result
 
     @property
@@ -121,12 +521,32 @@ class HandleResult(Generic[T], Handle):
 
 
 class HandleStats(Handle):
-    def __init__(self, timings, it_closure):
+    __slots__ = ('__it', '__histogram', '__rate', '__total')
+
+    def __init__(self, timings, it_closure, histogram: Histogram | None = None,
+                 window: float = 5., total: int | None = None):
         super(HandleStats, self).__init__(timings)
         self.__it = it_closure
+        self.__histogram = histogram
+        self.__rate: float | RecentRate = window  # replaced by its estimator when first read.
+        self.__total = total
 
     def __iter__(self):
-        return self.__it()
+        return self.__it(self)
+
+    def __aiter__(self):  # the handle of an async iterable must be iterated with `async for`.
+        return self.__it(self)
+
+    @property
+    def histogram(self) -> Histogram | None:
+        """Return the histogram of the time between consecutive elements.
+        This is dynamically updated in real time.
+
+        Returns:
+            the histogram, or None if not enabled.
+
+        """
+        return self.__histogram
 
     @property
     def count(self) -> int:
@@ -161,8 +581,23 @@ class HandleStats(Handle):
             the human representation.
 
         """
+        from .human_count import HumanCount
         return HumanCount(self.count, unit)
 
+    @property
+    def count_bytes_human(self) -> HumanCount:
+        """Return a beautiful representation of the current count as bytes, in IEC units
+        regardless of `FEATURES`, e.g. with `weight=nbytes`.
+        This is dynamically updated in real time.
+
+        Returns:
+            the human representation.
+
+        """
+        from .features import IEC
+        from .human_count import HumanCount
+        return HumanCount(self.count, 'B', IEC)
+
     @property
     def throughput(self) -> float:
         """Return the current throughput in items per second.
@@ -199,4 +634,134 @@ class HandleStats(Handle):
             the human representation.
 
         """
+        from .human_throughput import HumanThroughput
         return HumanThroughput(self.throughput, unit)
+
+    @property
+    def throughput_bytes_human(self) -> HumanThroughput:
+        """Return a beautiful representation of the current throughput as bytes per second,
+        in IEC units regardless of `FEATURES`, e.g. with `weight=nbytes`.
+
+        Returns:
+            the human representation.
+
+        """
+        from .features import IEC
+        from .human_throughput import HumanThroughput
+        return HumanThroughput(self.throughput, 'B', IEC)
+
+    @property
+    def throughput_recent(self) -> float:
+        """Return the recent throughput in items per second, an exponentially weighted
+        moving average of the rates between reads, with the time constant `window`.
+        It is updated by the reads, so it is safe to read from any thread, and it costs
+        nothing per item. But it needs to be read periodically, at intervals well below
+        `window`, to follow the current speed: the first read returns the average of the
+        whole iteration, like `throughput`, and a single read after a long time still
+        weighs all of it.
+
+        Returns:
+            the number of items per second.
+
+        """
+        rate = self.__rate
+        if isinstance(rate, (int, float)):
+            from .rate import CREATE_LOCK, RecentRate
+            with CREATE_LOCK:
+                if isinstance(self.__rate, (int, float)):
+                    self.__rate = RecentRate(self.__rate)
+            rate = self.__rate
+        return rate.update(self)
+
+    @property
+    def throughput_recent_human(self) -> HumanThroughput:
+        """Return a beautiful representation of the recent throughput.
+        It dynamically calculates the best unit to use.
+
+        Returns:
+            the human representation.
+
+        """
+        return self.throughput_recent_human_as('')
+
+    def throughput_recent_human_as(self, unit: str) -> HumanThroughput:
+        """Return a beautiful representation of the recent throughput.
+        It dynamically calculates the best unit to use.
+
+        Args:
+            unit: what is being measured
+
+        Returns:
+            the human representation.
+
+        """
+        from .human_throughput import HumanThroughput
+        return HumanThroughput(self.throughput_recent, unit)
+
+    @property
+    def throughput_recent_bytes_human(self) -> HumanThroughput:
+        """Return a beautiful representation of the recent throughput as bytes per second,
+        in IEC units regardless of `FEATURES`, e.g. with `weight=nbytes`.
+
+        Returns:
+            the human representation.
+
+        """
+        from .features import IEC
+        from .human_throughput import HumanThroughput
+        return HumanThroughput(self.throughput_recent, 'B', IEC)
+
+    @property
+    def total(self) -> int | None:
+        """Return the total number of items, from the length of the iterable or `total=`.
+
+        Returns:
+            the total number of items, or None if unknown.
+
+        """
+        return self.__total
+
+    @property
+    def remaining(self) -> int | None:
+        """Return the number of items still to be processed.
+        This is dynamically updated in real time.
+
+        Returns:
+            the number of remaining items, or None if the total is unknown.
+
+        """
+        if self.__total is None:
+            return None
+        return max(self.__total - self.count, 0)
+
+    @property
+    def percent(self) -> float | None:
+        """Return the percentage of the items already processed, from 0 to 100.
+        This is dynamically updated in real time.
+
+        Returns:
+            the percentage, or None if the total is unknown.
+
+        """
+        if self.__total is None:
+            return None
+        return min(100. * self.count / self.__total, 100.) if self.__total else 100.
+
+    @property
+    def eta(self) -> HumanDuration | None:
+        """Return the estimated time to process the remaining items.
+        It uses the recent throughput, so it keeps up when the rate drifts, as long as
+        it (or the recent throughput) is read periodically.
+
+        Returns:
+            the human representation, or None if the total or the rate is unknown.
+
+        """
+        remaining = self.remaining
+        if remaining is None:
+            return None
+        from .human_duration import HumanDuration
+        if not remaining:
+            return HumanDuration(0.)
+        rate = self.throughput_recent
+        return HumanDuration(remaining / rate) if rate > 0. else None
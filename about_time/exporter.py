@@ -0,0 +1,274 @@
+import os
+import socket
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .core import Handle
+
+_Record = Tuple[str, float, int]  # name, duration in seconds, count of items.
+
+
+class Metric(object):
+    """The cumulative totals of one name: the number of timings, their count of items and
+    the sum of their durations."""
+    __slots__ = ('calls', 'count', 'seconds')
+
+    def __init__(self, calls: int = 0, count: int = 0, seconds: float = 0.):
+        self.calls, self.count, self.seconds = calls, count, seconds
+
+    def __add__(self, other: 'Metric') -> 'Metric':
+        return Metric(self.calls + other.calls, self.count + other.count,
+                      self.seconds + other.seconds)
+
+    def __eq__(self, other):
+        return (self.calls, self.count, self.seconds) == (other.calls, other.count, other.seconds)
+
+    def __repr__(self):  # pragma: no cover
+        return 'Metric{{ calls={} count={} seconds={} }}'.format(
+            self.calls, self.count, self.seconds)
+
+
+class Exporter(object):
+    """Collect handles and named timers into metrics, and flush them in batches from a
+    background thread to a sink, like `PrometheusFile` or `StatsD`.
+
+    Recording only appends to a bounded deque, so it never blocks the timed code; if
+    the thread falls behind by more than `max_pending` records, the oldest are dropped.
+
+    >>> with Exporter(StatsD('localhost', 8125), interval=10.) as exporter:
+    ....    t = about_time(func)
+    ....    exporter.add('func', t)
+
+    Args:
+        sink: where to send the metrics
+        interval: the number of seconds between flushes
+        timers: whether to also export all the named timers
+        max_pending: the maximum number of records waiting for the next flush
+
+    """
+
+    def __init__(self, sink, interval: float = 10., timers: bool = True,
+                 max_pending: int = 100000):
+        assert interval > 0.
+        self.__sink = sink
+        self.__interval = interval
+        self.__timers = timers
+        self.__pending = deque(maxlen=max_pending)
+        self.__metrics: Dict[str, Metric] = {}
+        self.__flush_lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+
+    def record(self, name: str, duration: float, count: int = 1) -> None:
+        """Record a timing, to be exported on the next flush.
+
+        Args:
+            name: the name of the metric
+            duration: the number of seconds
+            count: the number of items processed in it
+
+        """
+        self.__pending.append((name, duration, count))
+
+    def add(self, name: str, handle: Handle) -> None:
+        """Record a finished handle, to be exported on the next flush.
+        The count of a `HandleStats` is included, other handles count as one item.
+
+        Args:
+            name: the name of the metric
+            handle: any handle
+
+        """
+        self.__pending.append((name, handle.duration, getattr(handle, 'count', 1)))
+
+    def metrics(self) -> Dict[str, Metric]:
+        """Return a snapshot of the cumulative metrics, as of the last flush."""
+        with self.__flush_lock:
+            return {name: Metric(m.calls, m.count, m.seconds)
+                    for name, m in self.__metrics.items()}
+
+    def flush(self) -> None:
+        """Drain the pending records into the metrics, and send them to the sink.
+        It is called periodically by the background thread, but can also be called
+        directly. Errors of the sink are kept in `last_error`, and never raised.
+        """
+        with self.__flush_lock:
+            pending, batch = self.__pending, []
+            try:
+                while True:
+                    batch.append(pending.popleft())
+            except IndexError:
+                pass
+
+            metrics = self.__metrics
+            for name, duration, count in batch:
+                m = metrics.get(name)
+                if m is None:
+                    m = metrics[name] = Metric()
+                m.calls += 1
+                m.count += count
+                m.seconds += duration
+
+            timer_metrics = {}
+            if self.__timers:
+                from .timers import timers
+                for name, t in timers().items():
+                    s = t.stats()
+                    timer_metrics[name] = Metric(s.count, s.count, s.total)
+
+            try:
+                self.__sink.send(metrics, timer_metrics, batch)
+            except Exception as e:  # any error would kill the background thread.
+                self.last_error = e
+
+    def start(self) -> 'Exporter':
+        """Start the background thread, which flushes every `interval` seconds."""
+        if self.__thread is None:
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.__run, name='about_time.Exporter',
+                                             daemon=True)
+            self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread, flush for the last time, and close the sink if it
+        has a `close()`, e.g. the socket of `StatsD`."""
+        thread, self.__thread = self.__thread, None
+        if thread is not None:
+            self.__stop.set()
+            thread.join()
+        self.flush()
+        close = getattr(self.__sink, 'close', None)
+        if close is not None:
+            close()
+
+    def __run(self):
+        while not self.__stop.wait(self.__interval):
+            self.flush()
+
+    def __enter__(self) -> 'Exporter':
+        return self.start()
+
+    def __exit__(self, *_exc):
+        self.stop()
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+class PrometheusFile(object):
+    """Write the metrics as a Prometheus text file, e.g. for the textfile collector of the
+    node exporter, labeled by name. The file is replaced atomically on each flush.
+
+    Args:
+        path: the path of the file, which should end with ".prom"
+        prefix: the prefix of the names of the metrics
+
+    """
+
+    def __init__(self, path: str, prefix: str = 'about_time'):
+        self.path = path
+        self.prefix = prefix
+
+    def render(self, metrics: Dict[str, Metric]) -> str:
+        """Render the metrics in the Prometheus text format."""
+        p, items = self.prefix, sorted(metrics.items())
+        lines = ['# HELP {}_seconds The durations of the timings.'.format(p),
+                 '# TYPE {}_seconds summary'.format(p)]
+        for name, m in items:
+            label = '{{name="{}"}}'.format(_escape(name))
+            lines.append('{}_seconds_sum{} {!r}'.format(p, label, float(m.seconds)))
+            lines.append('{}_seconds_count{} {}'.format(p, label, m.calls))
+        lines += ['# HELP {}_items_total The items processed in the timings.'.format(p),
+                  '# TYPE {}_items_total counter'.format(p)]
+        for name, m in items:
+            lines.append('{}_items_total{{name="{}"}} {}'.format(p, _escape(name), m.count))
+        return '\n'.join(lines) + '\n'
+
+    def send(self, metrics: Dict[str, Metric], timer_metrics: Dict[str, Metric],
+             _batch: List[_Record]) -> None:
+        merged = dict(metrics)
+        for name, m in timer_metrics.items():
+            merged[name] = merged[name] + m if name in merged else m
+        tmp = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.render(merged))
+        os.replace(tmp, self.path)
+
+
+class StatsD(object):
+    """Send the metrics as StatsD UDP packets, each packed with as many lines as fit.
+
+    Each recorded timing is sent as a timer in milliseconds, and its items as a counter.
+    The named timers are already aggregated, so what they accumulated since the last
+    flush is sent as one timer with their mean and a sample rate, which StatsD servers
+    scale back to the right number of timings.
+
+    The host is resolved when first sending, to an IPv4 or IPv6 address.
+
+    Args:
+        host: the host of the StatsD server
+        port: the port of the StatsD server
+        prefix: the prefix of the names of the metrics
+        max_packet: the maximum size of a packet in bytes, 1432 fits in an Ethernet MTU
+
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8125, prefix: str = 'about_time',
+                 max_packet: int = 1432):
+        self.address = host, port
+        self.prefix = prefix
+        self.max_packet = max_packet
+        self.__socket, self.__address = None, None
+        self.__sent: Dict[str, Metric] = {}  # the totals of the timers already sent.
+
+    def lines(self, timer_metrics: Dict[str, Metric], batch: List[_Record]) -> List[str]:
+        """Render the lines of this flush in the StatsD format. The timers are rendered
+        as what they accumulated since they were last sent successfully."""
+        return [line for line, _ in self.__lines(timer_metrics, batch)]
+
+    def __lines(self, timer_metrics, batch):  # the lines, with the name of their timer.
+        p, lines = self.prefix, []
+        for name, duration, count in batch:
+            lines.append(('{}.{}:{:.6g}|ms'.format(p, name, duration * 1e3), None))
+            if count != 1:
+                lines.append(('{}.{}.items:{}|c'.format(p, name, count), None))
+
+        for name, m in sorted(timer_metrics.items()):
+            sent = self.__sent.get(name, Metric())
+            calls, seconds = m.calls - sent.calls, m.seconds - sent.seconds
+            if calls > 0:
+                lines.append(('{}.{}:{:.6g}|ms|@{:.6g}'.format(
+                    p, name, seconds / calls * 1e3, 1. / calls), name))
+        return lines
+
+    def send(self, _metrics: Dict[str, Metric], timer_metrics: Dict[str, Metric],
+             batch: List[_Record]) -> None:
+        if self.__socket is None:
+            family, _, _, _, self.__address = socket.getaddrinfo(
+                *self.address, type=socket.SOCK_DGRAM)[0]
+            self.__socket = socket.socket(family, socket.SOCK_DGRAM)
+        packet, names = b'', []
+        for line, name in self.__lines(timer_metrics, batch):
+            data = line.encode()
+            if packet and len(packet) + 1 + len(data) > self.max_packet:
+                self.__send(packet, names, timer_metrics)
+                packet, names = b'', []
+            packet = packet + b'\n' + data if packet else data
+            if name is not None:
+                names.append(name)
+        if packet:
+            self.__send(packet, names, timer_metrics)
+
+    def __send(self, packet, names, timer_metrics):
+        self.__socket.sendto(packet, self.__address)
+        for name in names:  # only the timers sent, so the failed deltas are sent next time.
+            self.__sent[name] = timer_metrics[name]
+
+    def close(self) -> None:
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
@@ -5,6 +5,24 @@ class Features:
         self._feature_space = False
         self._feature_1024 = False
         self._feature_iec = False
+        self._compiled = {}
+
+    def compiled(self, compile_fn):
+        """Return the formatter compiled by `compile_fn` for the current features.
+        It is cached until any of the features change.
+
+        Args:
+            compile_fn: a function which receives this object and returns a formatter
+
+        Returns:
+            the formatter.
+
+        """
+        try:
+            return self._compiled[compile_fn]
+        except KeyError:
+            fn = self._compiled[compile_fn] = compile_fn(self)
+            return fn
 
     @property
     def feature_space(self) -> bool:
@@ -21,15 +39,17 @@ class Features:
     @feature_space.setter
     def feature_space(self, value: bool):  # pragma: no cover
         self._feature_space = bool(value)
+        self._compiled.clear()
 
     @feature_1024.setter
     def feature_1024(self, value: bool):  # pragma: no cover
         self._feature_1024 = bool(value)
+        self._compiled.clear()
 
     @feature_iec.setter
     def feature_iec(self, value: bool):  # pragma: no cover
         self._feature_iec = bool(value)
-        self.feature_1024 = value
+        self.feature_1024 = value  # also clears the compiled formatters.
 
 
 def conv_space(space: bool) -> str:
@@ -37,3 +57,7 @@ def conv_space(space: bool) -> str:
 
 
 FEATURES = Features()
+
+# binary scales with IEC prefixes, e.g. for bytes, regardless of the global FEATURES.
+IEC = Features()
+IEC.feature_iec = True
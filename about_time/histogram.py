@@ -0,0 +1,151 @@
+from typing import Iterable
+
+from .human_duration import HumanDuration
+
+# HDR-style log-linear buckets, over integer nanoseconds: values below `2 ** SUB_BITS` have
+# their own exact buckets, and each power of two above it is split into `2 ** (SUB_BITS - 1)`
+# linear sub-buckets, so the relative error is always below `1 / 2 ** (SUB_BITS - 1)`.
+SUB_BITS = 7
+HALF = 1 << (SUB_BITS - 1)
+BUCKETS = (64 - SUB_BITS + 2) * HALF  # covers all durations up to 2 ** 64 ns (584 years).
+
+
+def bucket_index(ns: int) -> int:
+    """Return the bucket index of a duration, in O(1)."""
+    shift = ns.bit_length() - SUB_BITS
+    if shift <= 0:
+        return ns
+    return (shift << (SUB_BITS - 1)) + (ns >> shift)
+
+
+def bucket_range(index: int) -> tuple:
+    """Return the lowest and highest durations of a bucket, inclusive."""
+    if index < 2 * HALF:
+        return index, index
+    shift = index // HALF - 1
+    mantissa = index - (shift << (SUB_BITS - 1))
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram(object):
+    """A fixed-memory latency histogram, with log-bucketed integer nanoseconds.
+
+    Recording is O(1) and does not allocate any memory, so it can be used inside hot loops.
+    Histograms can be merged, to summarize several handles.
+    """
+
+    def __init__(self):
+        self._counts = [0] * BUCKETS
+        self._total = 0
+        self._max = 0
+
+    def record(self, ns: int) -> None:
+        """Record a duration.
+
+        Args:
+            ns: the duration in integer nanoseconds
+
+        """
+        shift = ns.bit_length() - SUB_BITS  # inlined `bucket_index`.
+        self._counts[ns if shift <= 0 else (shift << (SUB_BITS - 1)) + (ns >> shift)] += 1
+        self._total += 1
+        if ns > self._max:
+            self._max = ns
+
+    def merge(self, other: 'Histogram') -> 'Histogram':
+        """Add all the durations of another histogram into this one.
+
+        Args:
+            other: the histogram to merge
+
+        Returns:
+            this same histogram.
+
+        """
+        self._counts = [a + b for a, b in zip(self._counts, other._counts)]
+        self._total += other._total
+        self._max = max(self._max, other._max)
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable['Histogram']) -> 'Histogram':
+        """Create a new histogram with all the durations of several others.
+
+        Args:
+            histograms: the histograms to merge
+
+        Returns:
+            the new histogram.
+
+        """
+        result = cls()
+        for h in histograms:
+            result.merge(h)
+        return result
+
+    def __add__(self, other: 'Histogram') -> 'Histogram':
+        return Histogram().merge(self).merge(other)
+
+    @property
+    def count(self) -> int:
+        """Return the number of recorded durations."""
+        return self._total
+
+    def percentile_ns(self, p: float) -> int:
+        """Return the duration below which `p` percent of the durations fall.
+
+        Args:
+            p: the percentile, from 0 to 100
+
+        Returns:
+            the number of nanoseconds, with the bucket relative error.
+
+        """
+        assert 0. <= p <= 100.
+        if not self._total:
+            return 0
+        rank, seen = max(1, -(-self._total * p // 100)), 0
+        if rank >= self._total:
+            return self._max
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                low, high = bucket_range(index)
+                return min((low + high + 1) // 2, self._max)
+        return self._max  # pragma: no cover
+
+    def percentile(self, p: float) -> HumanDuration:
+        """Return a beautiful representation of a percentile.
+
+        Args:
+            p: the percentile, from 0 to 100
+
+        Returns:
+            the human representation.
+
+        """
+        return HumanDuration(self.percentile_ns(p) / 1e9)
+
+    @property
+    def p50(self) -> HumanDuration:
+        """Return the median duration."""
+        return self.percentile(50.)
+
+    @property
+    def p90(self) -> HumanDuration:
+        """Return the 90th percentile duration."""
+        return self.percentile(90.)
+
+    @property
+    def p99(self) -> HumanDuration:
+        """Return the 99th percentile duration."""
+        return self.percentile(99.)
+
+    @property
+    def max(self) -> HumanDuration:
+        """Return the maximum duration, which is exact."""
+        return HumanDuration(self._max / 1e9)
+
+    def __repr__(self):  # pragma: no cover
+        return 'Histogram{{ count={} p50={} p90={} p99={} max={} }}'.format(
+            self._total, self.p50, self.p90, self.p99, self.max)
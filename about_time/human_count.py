@@ -1,6 +1,11 @@
-from typing import Optional
+import re
+import struct
+import sys
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
 
-from .features import FEATURES, conv_space
+from .features import FEATURES, Features, conv_space
 
 SI_1000_SPEC = ('', 'k', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y')
 SI_1024_SPEC = ('', 'K', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y')
@@ -9,16 +14,31 @@ DECIMALS = [1, 1, 1, 2, 2, 2, 2, 2, 2]
 
 
 def __human_count(val: float, unit: str, prec: Optional[int], space: str, divisor: int,
-                  spec: tuple) -> str:
-    for scale, dec in zip(spec, DECIMALS):
-        r = round(val, dec)
-        if r >= divisor:
-            val /= divisor
-            continue
-        break
+                  spec: tuple, bounds: tuple) -> str:
+    if prec is None and type(val) is int and 0 <= val < divisor:  # pure integer fast path.
+        return '{}{}{}'.format(val, space, unit)
+
+    # the number of scales to go up, in O(1): `bounds` are the largest values which still
+    # fit in each scale, so it's the number of them smaller than the value (NaN-safe).
+    lo = 0
+    if divisor == 1024 and type(val) is int and val > 0:  # the bits already tell the scale.
+        lo = min((val.bit_length() - 1) // 10, len(bounds))
+    n = bisect_left(bounds, val, lo)
+    if n and type(val) is int and val > 1 << 53:
+        # huge ints are finer than the float bounds, so they might have passed the last one.
+        if round(_divided(val, divisor, n - 1), DECIMALS[n - 1]) < divisor:
+            n -= 1
+    val = _divided(val, divisor, n)
+    if n < len(spec):
+        r, scale = round(val, DECIMALS[n]), spec[n]
     else:
         r, scale = val, '+'
 
+    return _render(val, r, prec, space, scale, unit)
+
+
+def _render(val: float, r: float, prec: Optional[int], space: str, first: str,
+            second: str) -> str:
     if prec is not None:
         r = round(val, prec)
     elif r % 1. == 0.:
@@ -27,28 +47,262 @@ def __human_count(val: float, unit: str, prec: Optional[int], space: str, diviso
         prec = 1
     else:
         prec = 2
-    return '{:.{}f}{}{}{}'.format(r, prec, space, scale, unit)
+    return '{:.{}f}{}{}{}'.format(r, prec, space, first, second)
 
 
-def fn_human_count(space: bool, d1024: bool, iec: bool):
-    def run(val: float, unit: str, prec: Optional[int] = None):
-        return __human_count(val, unit, prec, space, divisor, spec)
-
-    space = conv_space(space)
-    divisor, spec = {
+def _divisor_spec(d1024: bool, iec: bool) -> tuple:
+    return {
         (False, False): (1000, SI_1000_SPEC),
         (True, False): (1024, SI_1024_SPEC),
         (True, True): (1024, IEC_1024_SPEC),
         (False, True): (1024, IEC_1024_SPEC),  # invalid combination, which just returns the above.
     }[(d1024, iec)]
+
+
+def fn_human_count(space: bool, d1024: bool, iec: bool):
+    def run(val: float, unit: str, prec: Optional[int] = None):
+        return __human_count(val, unit, prec, space, divisor, spec, bounds)
+
+    space = conv_space(space)
+    divisor, spec = _divisor_spec(d1024, iec)
+    bounds = scale_bounds(divisor)
     return run
 
 
+def _float_bits(x: float) -> int:
+    return struct.unpack('<q', struct.pack('<d', x))[0]
+
+
+def _bits_float(b: int) -> float:
+    return struct.unpack('<d', struct.pack('<q', b))[0]
+
+
+def _threshold(predicate: Callable[[float], bool], high: float) -> float:
+    """Return the smallest non-negative float which satisfies a monotonic predicate,
+    by bisecting the bit patterns of floats, which sort the same as their values."""
+    low, high = 0, _float_bits(high)
+    while low < high:
+        mid = (low + high) // 2
+        if predicate(_bits_float(mid)):
+            high = mid
+        else:
+            low = mid + 1
+    return _bits_float(low)
+
+
+@lru_cache(maxsize=None)
+def round_threshold(size: float, dec: int) -> float:
+    """Return the smallest float which, rounded to `dec` decimals, is at least `size`."""
+    return _threshold(lambda x: round(x, dec) >= size, size)
+
+
+def _divided(val: float, divisor: int, times: int) -> float:
+    for _ in range(times):  # the very same divisions of the previous scale-by-scale search.
+        val /= divisor
+    return val
+
+
+def search_bounds(steps: tuple) -> tuple:
+    """Return, for each step of a scale search, the largest value which stops on it.
+
+    Each step is a `(size, divisor, dec)`, and the value stops on the first step where
+    it rounded to `dec` decimals is smaller than `size`, otherwise it is divided by
+    `divisor` and goes to the next one. The bounds consider those very same sequential
+    divisions, so the number of bounds smaller than a value is always exactly the number
+    of steps it passes.
+    """
+
+    def passes(x: float, n: int) -> bool:
+        for _, div, _ in steps[:n]:
+            x /= div
+        size, _, dec = steps[n]
+        return round(x, dec) >= size
+
+    return tuple(
+        _bits_float(_float_bits(_threshold(lambda x: passes(x, n), sys.float_info.max)) - 1)
+        for n in range(len(steps))
+    )
+
+
+@lru_cache(maxsize=None)
+def scale_bounds(divisor: int) -> tuple:
+    """Return the bounds of the scale search of counts, see `search_bounds`."""
+    return search_bounds(tuple((divisor, divisor, dec) for dec in DECIMALS))
+
+
+def _vector_scales(np, val, divisor: int, steps: int):
+    """Run the scale search of `__human_count` over a whole float64 array, with the exact
+    same operations, returning the divided values and their scale indexes."""
+    index = np.zeros(val.shape, np.intp)
+    going = np.ones(val.shape, bool)
+    for dec in DECIMALS[:steps]:
+        going &= val >= round_threshold(divisor, dec)
+        if not going.any():
+            break
+        val = np.where(going, val / divisor, val)
+        index += going
+    return val, index
+
+
+def _vectorizable(values):
+    """Return numpy and a float64 array if numpy is available and the conversion is exact,
+    otherwise None and the python values."""
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        return None, values
+    arr = np.asarray(values)
+    if arr.dtype.kind == 'f' or arr.dtype.kind in 'iu' and (
+            not arr.size or int(np.abs(arr).max()) <= 2 ** 53):
+        return np, arr.astype(np.float64).ravel()
+    return None, arr.ravel().tolist() if arr.dtype.kind != 'O' or arr.ndim else values
+
+
+def format_many(values: Sequence[float], unit: str, prec: Optional[int] = None) -> List[str]:
+    """Render many counts at once, exactly as `HumanCount` would, with the current features.
+
+    If numpy is installed, the scales, the rounding and the precisions of all values are
+    found in vectorized form, and numpy arrays are accepted, otherwise the compiled
+    formatter is applied to each value. Only the final string formatting is per value.
+
+    Args:
+        values: a sequence or numpy array of counts
+        unit: what is being measured
+        prec: an optional custom precision
+
+    Returns:
+        the human friendly representations.
+
+    """
+    np, arr = _vectorizable(values)
+    if np is None:
+        fmt = FEATURES.compiled(_compile)
+        return [fmt(v, unit, prec) for v in arr]
+
+    space = conv_space(FEATURES.feature_space)
+    divisor, spec = _divisor_spec(FEATURES.feature_1024, FEATURES.feature_iec)
+    val, index = _vector_scales(np, arr, divisor, len(spec))
+    return _format_scaled(np, val, index, unit, prec, space, spec)
+
+
+def _format_scaled(np, val, index, unit: str, prec: Optional[int], space: str, spec: tuple,
+                   suffix: str = '') -> List[str]:
+    tails = [space + scale + unit + suffix for scale in spec] + [space + '+' + unit + suffix]
+    return _render_many(np, val, index, DECIMALS[:len(spec)] + [None], tails, prec)
+
+
+def _round_many(np, val, dec):
+    """Round a float64 array like the builtin `round`, which rounds the exact decimal value.
+
+    The vectorized `rint(val * 10 ** dec) / 10 ** dec` only differs from it near the ties,
+    where the multiplication might have crossed them, or when the power or the product are
+    not exact, so only those few values are rounded in python.
+    """
+    dec = np.broadcast_to(dec, val.shape)
+    with np.errstate(over='ignore', invalid='ignore'):
+        mult = np.power(10., dec)
+        scaled = val * mult
+        r = np.rint(scaled) / mult
+        fast = ((np.abs(scaled % 1. - .5) > 1e-6) & (np.abs(scaled) < 2. ** 30)
+                & (dec >= 0) & (dec <= 22))
+    for i in np.flatnonzero(~fast).tolist():
+        r[i] = round(float(val[i]), int(dec[i]))
+    return r
+
+
+def _render_many(np, val, index, decimals: list, tails: list,
+                 prec: Optional[int]) -> List[str]:
+    """Render a float64 array like `_render`, with the rounding and the precision choice in
+    vectorized form, given the scale index of each value, and the decimals (None for no
+    rounding) and the text after the number of each scale."""
+    if prec is not None:
+        r = _round_many(np, val, prec)
+        fmts = [['{{:.{}f}}{}'.format(prec, _escaped(t))] * 3 for t in tails]
+        precs = np.zeros(val.shape, np.intp)  # the only format of each scale.
+    else:
+        dec = np.array([-1 if d is None else d for d in decimals])[index]
+        r = np.where(dec >= 0, _round_many(np, val, np.maximum(dec, 0)), val)
+        fmts = [['{{:.{}f}}{}'.format(p, _escaped(t)) for p in range(3)] for t in tails]
+        with np.errstate(invalid='ignore'):
+            precs = np.where(r % 1. == 0., 0, np.where((r * 10.) % 1. == 0., 1, 2))
+    return [fmts[i][p].format(x) for x, i, p in zip(r.tolist(), index.tolist(), precs.tolist())]
+
+
+def _escaped(text: str) -> str:
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def _compile(features) -> Callable[..., str]:
+    return fn_human_count(features.feature_space, features.feature_1024, features.feature_iec)
+
+
+_NUMBER = r'(\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)'
+_SCALE = r'(Ki|Mi|Gi|Ti|Pi|Ei|Zi|Yi|[kKMGTPEZY+])'
+_COUNT = re.compile(_NUMBER + ' ?' + _SCALE + '?')
+# the units accepted when not given: they start with a capital, so they can't be part of a
+# word with the scale, e.g. "10Minutes" or "2 Gigs", which would read as "Mi" and "Gi".
+_ANY_UNIT = re.compile(r'[A-Z][A-Za-z]*\Z')
+_IEC_MULT = {s: 1024 ** i for i, s in enumerate(IEC_1024_SPEC) if s}
+_SI_1000_MULT = {s: 1000 ** i for i, s in enumerate(SI_1000_SPEC) if s}
+_SI_1024_MULT = {s: 1024 ** i for i, s in enumerate(SI_1024_SPEC) if s}
+
+
+def parse_count(text: str, unit: Optional[str] = None, d1024: Optional[bool] = None) -> float:
+    """Parse a count in the format `HumanCount` renders, back to a number.
+
+    It understands every scale of all the features, e.g. "1.5k", "1.5 kB", "2.3Mi" or
+    "1.2+". Only the "M", "G", "T", and up scales are ambiguous, which are in base 1024
+    if `d1024`, otherwise in base 1000; "k" is always 1000, "K" and the IEC ones 1024.
+
+    Args:
+        text: the human representation
+        unit: the expected unit, which must be at the end, or None to accept only units
+            which start with a capital letter, e.g. "B", but not "rows"
+        d1024: whether the ambiguous scales are in base 1024, or None to follow `FEATURES`
+
+    Returns:
+        the count.
+
+    Raises:
+        ValueError: if it is not a valid human count.
+
+    """
+    return _parse_count(text, unit, FEATURES.feature_1024 if d1024 is None else d1024)
+
+
+@lru_cache(maxsize=1024)
+def _parse_count(text: str, unit: Optional[str], d1024: bool) -> float:
+    body = text.strip()
+    if unit is not None:
+        if not body.endswith(unit):
+            raise ValueError('invalid human count, without unit {!r}: {!r}'.format(unit, text))
+        body = body[:len(body) - len(unit)]
+    m = _COUNT.match(body)
+    if not m or m.end() != len(body) and (unit is not None or not _ANY_UNIT.match(body, m.end())):
+        raise ValueError('invalid human count: {!r}'.format(text))
+    return _scaled(float(m.group(1)), m.group(2), d1024)
+
+
+def _scaled(val: float, scale: Optional[str], d1024: bool) -> float:
+    if not scale:
+        return val
+    if scale == '+':  # beyond the last scale.
+        return val * (1024 if d1024 else 1000) ** len(SI_1000_SPEC)
+    if scale in _IEC_MULT:
+        return val * _IEC_MULT[scale]
+    if scale == 'k':
+        return val * 1000
+    return val * (_SI_1024_MULT if d1024 or scale == 'K' else _SI_1000_MULT)[scale]
+
+
 class HumanCount(object):
-    def __init__(self, value, unit):
+    __slots__ = ('_value', '_unit', '_features')
+
+    def __init__(self, value, unit, features: Optional[Features] = None):
         assert value >= 0.
         self._value = value
         self._unit = unit
+        self._features = features  # overrides the global FEATURES, e.g. with `IEC`.
 
     @property
     def value(self):
@@ -69,8 +323,22 @@ class HumanCount(object):
             the human friendly representation.
 
         """
-        return fn_human_count(FEATURES.feature_space, FEATURES.feature_1024,
-                              FEATURES.feature_iec)(self._value, self._unit, prec)
+        return (self._features or FEATURES).compiled(_compile)(self._value, self._unit, prec)
+
+    @staticmethod
+    def formatter() -> Callable[..., str]:
+        """Return the formatter for the current features, to render many counts
+        without creating objects. It is bound to the features at the time of the call.
+
+        >>> fmt = HumanCount.formatter()
+        >>> fmt(1230., 'B'), fmt(1230., 'B', 2)
+        ('1.2kB', '1.23kB')
+
+        Returns:
+            the formatter function, with params `(value, unit, prec=None)`.
+
+        """
+        return FEATURES.compiled(_compile)
 
     def __str__(self):
         return self.as_human()
@@ -1,6 +1,11 @@
-from typing import Optional
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
 
 from .features import FEATURES, conv_space
+from .human_count import (_NUMBER, _render_many, _vectorizable, round_threshold,
+                          search_bounds)
 
 SPEC = (
     (1e3, 1e3, "ns", 1),
@@ -12,14 +17,21 @@ SPEC = (
 )
 
 
-def __human_duration(val: float, prec: Optional[int], space: str) -> str:
+@lru_cache(maxsize=None)
+def duration_bounds() -> tuple:
+    """Return the bounds of the scale search of durations, see `search_bounds`."""
+    return search_bounds(tuple((size, div_next, dec) for size, div_next, _, dec in SPEC))
+
+
+def __human_duration(val: float, prec: Optional[int], space: str, bounds: tuple) -> str:
     val *= 1e9
-    for size, div_next, scale, dec in SPEC:
-        r = round(val, dec)
-        if r >= size:
+    n = bisect_left(bounds, val)  # the number of scales to go up, in O(1) (NaN-safe).
+    if n:
+        for _, div_next, _, _ in SPEC[:n]:  # the same divisions of the scale-by-scale search.
             val /= div_next
-            continue
-
+    if n < len(SPEC):
+        _, _, scale, dec = SPEC[n]
+        r = round(val, dec)
         if prec is not None:
             r = round(val, prec)
         elif r % 1. == 0.:
@@ -48,13 +60,106 @@ def __human_duration(val: float, prec: Optional[int], space: str) -> str:
 
 def fn_human_duration(space: bool):
     def run(val, prec: Optional[int] = None):
-        return __human_duration(val, prec, space)
+        return __human_duration(val, prec, space, bounds)
 
     space = conv_space(space)
+    bounds = duration_bounds()
     return run
 
 
+def _compile(features) -> Callable[..., str]:
+    return fn_human_duration(features.feature_space)
+
+
+def format_many(values: Sequence[float], prec: Optional[int] = None) -> List[str]:
+    """Render many durations at once, exactly as `HumanDuration` would, with the current
+    features.
+
+    If numpy is installed, the scales, the rounding and the precisions of all values are
+    found in vectorized form, and numpy arrays are accepted, otherwise the compiled
+    formatter is applied to each value. Only the final string formatting is per value,
+    and the minutes and hours formats are rendered by the formatter.
+
+    Args:
+        values: a sequence or numpy array of durations in seconds
+        prec: an optional custom precision
+
+    Returns:
+        the human friendly representations.
+
+    """
+    fmt = FEATURES.compiled(_compile)
+    np, arr = _vectorizable(values)
+    if np is None:
+        return [fmt(v, prec) for v in arr]
+
+    # the same scale search of `__human_duration`, over the whole array.
+    val = arr * 1e9
+    index = np.zeros(val.shape, np.intp)
+    going = np.ones(val.shape, bool)
+    for size, div_next, _, dec in SPEC:
+        going &= val >= round_threshold(size, dec)
+        if not going.any():
+            break
+        val = np.where(going, val / div_next, val)
+        index += going
+
+    space, last = conv_space(FEATURES.feature_space), len(SPEC)
+    scaled = index < last
+    decimals, tails = [dec for _, _, _, dec in SPEC], [space + scale for _, _, scale, _ in SPEC]
+    it = iter(_render_many(np, val[scaled], index[scaled], decimals, tails, prec))
+    return [next(it) if s else fmt(o, prec)  # minutes and hours.
+            for s, o in zip(scaled.tolist(), arr.tolist())]
+
+
+def _duration_divisors() -> dict:
+    div, result = 1e9, {}
+    for _, div_next, scale, _ in SPEC:
+        result[scale] = div
+        div /= div_next
+    result['us'] = result['µs']  # the ASCII alias, common in configs.
+    return result
+
+
+_DURATION_DIV = _duration_divisors()
+_DURATION = re.compile(_NUMBER + ' ?(' + '|'.join(_DURATION_DIV) + r')\Z')
+_MINUTES = re.compile(r'(\d+):(\d\d(?:\.\d*)?)\Z')
+_HOURS = re.compile(r'(\d+):(\d\d):(\d\d)\Z')
+
+
+@lru_cache(maxsize=1024)
+def parse_duration(text: str) -> float:
+    """Parse a duration in the format `HumanDuration` renders, back to seconds.
+
+    It understands every scale, e.g. "350µs" (or "350us"), "12.5 ms", "45.2s", and
+    the minutes and hours formats, e.g. "1:02.5" and "1:01:01".
+
+    Args:
+        text: the human representation
+
+    Returns:
+        the number of seconds.
+
+    Raises:
+        ValueError: if it is not a valid human duration.
+
+    """
+    body = text.strip()
+    m = _DURATION.match(body)
+    if m:
+        return float(m.group(1)) / _DURATION_DIV[m.group(2)]
+    m = _MINUTES.match(body)
+    if m:
+        return int(m.group(1)) * 60. + float(m.group(2))
+    m = _HOURS.match(body)
+    if m:
+        return int(m.group(1)) * 3600. + int(m.group(2)) * 60. + int(m.group(3))
+    raise ValueError('invalid human duration: {!r}'.format(text))
+
+
 class HumanDuration(object):
+    __slots__ = ('_value',)
+
     def __init__(self, value):
         assert value >= 0.
         self._value = value
@@ -74,7 +179,22 @@ class HumanDuration(object):
             the human friendly representation.
 
         """
-        return fn_human_duration(FEATURES.feature_space)(self._value, prec)
+        return FEATURES.compiled(_compile)(self._value, prec)
+
+    @staticmethod
+    def formatter() -> Callable[..., str]:
+        """Return the formatter for the current features, to render many durations
+        without creating objects. It is bound to the features at the time of the call.
+
+        >>> fmt = HumanDuration.formatter()
+        >>> fmt(.0156), fmt(.0156, 2)
+        ('15.6ms', '15.60ms')
+
+        Returns:
+            the formatter function, with params `(value, prec=None)`.
+
+        """
+        return FEATURES.compiled(_compile)
 
     def __str__(self):
         return self.as_human()
@@ -1,7 +1,11 @@
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
 
-from .features import FEATURES, conv_space
-from .human_count import fn_human_count
+from .features import FEATURES, Features, conv_space
+from .human_count import (_ANY_UNIT, _NUMBER, _divisor_spec, _format_scaled, _parse_count,
+                          _render_many, _vector_scales, _vectorizable, fn_human_count,
+                          round_threshold)
 
 SPEC = (
     (24., "/d", 2),
@@ -41,11 +45,111 @@ def fn_human_throughput(space: bool, d1024: bool, iec: bool):
     return run
 
 
+def _compile(features) -> Callable[..., str]:
+    return fn_human_throughput(features.feature_space, features.feature_1024,
+                               features.feature_iec)
+
+
+def format_many(values: Sequence[float], unit: str, prec: Optional[int] = None) -> List[str]:
+    """Render many throughputs at once, exactly as `HumanThroughput` would, with the current
+    features.
+
+    If numpy is installed, the scales, the rounding and the precisions of all values are
+    found in vectorized form, and numpy arrays are accepted, otherwise the compiled
+    formatter is applied to each value. Only the final string formatting is per value.
+
+    Args:
+        values: a sequence or numpy array of throughputs in items per second
+        unit: what is being measured
+        prec: an optional custom precision
+
+    Returns:
+        the human friendly representations.
+
+    """
+    np, arr = _vectorizable(values)
+    if np is None:
+        fmt = FEATURES.compiled(_compile)
+        return [fmt(v, unit, prec) for v in arr]
+
+    # the same scale search of `__human_throughput`, over the whole array.
+    val = arr * (60. * 60. * 24.)
+    index = np.zeros(val.shape, np.intp)
+    going = np.ones(val.shape, bool)
+    for size, _, dec in SPEC:
+        going &= val >= round_threshold(size, dec)
+        if not going.any():
+            break
+        val = np.where(going, val / size, val)
+        index += going
+
+    space, last = conv_space(FEATURES.feature_space), len(SPEC)
+    per_second = index == last
+    decimals, tails = [dec for _, _, dec in SPEC], [space + unit + scale for _, scale, _ in SPEC]
+    result = _render_many(np, val[~per_second], index[~per_second], decimals, tails, prec)
+    if per_second.any():  # the remaining ones are rendered as counts per second.
+        divisor, spec = _divisor_spec(FEATURES.feature_1024, FEATURES.feature_iec)
+        it, rest = iter(result), iter(_format_scaled(
+            np, *_vector_scales(np, val[per_second], divisor, len(spec)),
+            unit, prec, space, spec, '/s'))
+        result = [next(rest) if p else next(it) for p in per_second.tolist()]
+    return result
+
+
+_PERIODS = {'/d': 60. * 60. * 24., '/h': 60. * 60., '/m': 60.}
+_SLOW = re.compile(_NUMBER + ' ?')
+
+
+def parse_throughput(text: str, unit: Optional[str] = None,
+                     d1024: Optional[bool] = None) -> float:
+    """Parse a throughput in the format `HumanThroughput` renders, back to items per second.
+
+    It understands every scale, e.g. "12.5k/s", "12.5 kB/s", "2.3MiB/s", and the slow
+    ones, e.g. "1.5/m", "3.2 B/h" or "24/d". The scales of the counts per second are
+    parsed like `parse_count` does.
+
+    Args:
+        text: the human representation
+        unit: the expected unit, which must be before the period, or None to accept only
+            units which start with a capital letter, like `parse_count`
+        d1024: whether the ambiguous scales are in base 1024, or None to follow `FEATURES`
+
+    Returns:
+        the number of items per second.
+
+    Raises:
+        ValueError: if it is not a valid human throughput.
+
+    """
+    return _parse_throughput(text, unit, FEATURES.feature_1024 if d1024 is None else d1024)
+
+
+@lru_cache(maxsize=1024)
+def _parse_throughput(text: str, unit: Optional[str], d1024: bool) -> float:
+    body = text.strip()
+    period = body[-2:]
+    if period == '/s':
+        try:
+            return _parse_count(body[:-2], unit, d1024)
+        except ValueError:
+            raise ValueError('invalid human throughput: {!r}'.format(text)) from None
+    if period in _PERIODS:
+        body = body[:-2]
+        m = _SLOW.match(body)
+        if m and (body[m.end():] == unit or unit is None and (
+                m.end() == len(body) or _ANY_UNIT.match(body, m.end()))):
+            return float(m.group(1)) / _PERIODS[period]
+    raise ValueError('invalid human throughput: {!r}'.format(text))
+
+
 class HumanThroughput(object):
-    def __init__(self, value, unit):
+    __slots__ = ('_value', '_unit', '_features')
+
+    def __init__(self, value, unit, features: Optional[Features] = None):
         assert value >= 0.
         self._value = value
         self._unit = unit
+        self._features = features  # overrides the global FEATURES, e.g. with `IEC`.
 
     @property
     def value(self):
@@ -66,8 +170,22 @@ class HumanThroughput(object):
             the human friendly representation.
 
         """
-        return fn_human_throughput(FEATURES.feature_space, FEATURES.feature_1024,
-                                   FEATURES.feature_iec)(self._value, self._unit, prec)
+        return (self._features or FEATURES).compiled(_compile)(self._value, self._unit, prec)
+
+    @staticmethod
+    def formatter() -> Callable[..., str]:
+        """Return the formatter for the current features, to render many throughputs
+        without creating objects. It is bound to the features at the time of the call.
+
+        >>> fmt = HumanThroughput.formatter()
+        >>> fmt(2500., 'B'), fmt(2500., 'B', 2)
+        ('2.5kB/s', '2.50kB/s')
+
+        Returns:
+            the formatter function, with params `(value, unit, prec=None)`.
+
+        """
+        return FEATURES.compiled(_compile)
 
     def __str__(self):
         return self.as_human()
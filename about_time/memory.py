@@ -0,0 +1,111 @@
+import os
+import tracemalloc
+from typing import List, Optional
+
+from .features import IEC
+from .human_count import HumanCount
+
+# the allocations of the measuring itself are not interesting.
+_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, os.path.join(os.path.dirname(__file__), '*')))
+
+
+class AllocationSite(object):
+    """A line of code that allocated memory during a block, with its net allocations."""
+    __slots__ = ('where', 'size_bytes', 'count')
+
+    def __init__(self, where: str, size_bytes: int, count: int):
+        self.where = where
+        self.size_bytes = size_bytes
+        self.count = count
+
+    @property
+    def size(self) -> HumanCount:
+        """Return the magnitude of the net size, in IEC bytes; see `size_bytes` for
+        the sign."""
+        return HumanCount(abs(self.size_bytes), 'B', IEC)
+
+    def __str__(self):
+        return '{}: {}{} in {} blocks'.format(
+            self.where, '-' if self.size_bytes < 0 else '+', self.size, self.count)
+
+    def __repr__(self):  # pragma: no cover
+        return 'AllocationSite{{ where={!r} size_bytes={} }} -> {}'.format(
+            self.where, self.size_bytes, self)
+
+
+class MemoryStats(object):
+    """The memory allocated during a block, traced with `tracemalloc`.
+
+    If tracemalloc is not tracing yet, it is started on enter and stopped on exit. The
+    peak is reset on enter, so measuring nested blocks changes the peak of the outer
+    ones; on Python 3.8, which cannot reset it, the peak of a block is only an upper
+    bound if tracemalloc was already tracing.
+
+    Args:
+        top: the number of allocation sites to record, 0 for none
+
+    """
+    __slots__ = ('_top', '_started', '_start', '_snapshot', 'peak_bytes', 'net_bytes',
+                 'top')
+
+    def __init__(self, top: int = 0):
+        self._top = top
+        self._started, self._start, self._snapshot = False, 0, None
+        self.peak_bytes: Optional[int] = None
+        self.net_bytes: Optional[int] = None
+        self.top: List[AllocationSite] = []
+
+    def start(self) -> None:
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        if self._top:
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        if hasattr(tracemalloc, 'reset_peak'):  # pragma: no cover
+            tracemalloc.reset_peak()
+        self._start = tracemalloc.get_traced_memory()[0]
+
+    def stop(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        self.net_bytes, self.peak_bytes = current - self._start, max(peak - self._start, 0)
+        if self._top:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            diffs = snapshot.compare_to(self._snapshot, 'lineno')
+            self._snapshot = None
+            self.top = [AllocationSite(str(d.traceback[0]), d.size_diff, d.count_diff)
+                        for d in diffs[:self._top] if d.size_diff]
+        if self._started:
+            tracemalloc.stop()
+
+    @property
+    def peak(self) -> Optional[HumanCount]:
+        """Return the peak of the memory allocated during the block, in IEC bytes.
+
+        Returns:
+            the human representation, or None while the block is running.
+
+        """
+        return None if self.peak_bytes is None else HumanCount(self.peak_bytes, 'B', IEC)
+
+    @property
+    def net(self) -> Optional[HumanCount]:
+        """Return the magnitude of the memory still allocated after the block, in IEC
+        bytes; see `net_bytes` for the sign, which is negative if the block freed more
+        than it allocated.
+
+        Returns:
+            the human representation, or None while the block is running.
+
+        """
+        return None if self.net_bytes is None else HumanCount(abs(self.net_bytes), 'B', IEC)
+
+    def __str__(self):
+        if self.net_bytes is None:
+            return 'running'
+        return 'peak: {}, net: {}{}'.format(
+            self.peak, '-' if self.net_bytes < 0 else '+', self.net)
+
+    def __repr__(self):  # pragma: no cover
+        return 'MemoryStats{{ peak_bytes={} net_bytes={} }} -> {}'.format(
+            self.peak_bytes, self.net_bytes, self)
@@ -0,0 +1,45 @@
+import math
+import threading
+
+# only used to create the estimator of a handle, on its first read.
+CREATE_LOCK = threading.Lock()
+
+
+class RecentRate(object):
+    """An exponentially weighted moving average of a rate, updated by its readers.
+
+    The counting is never touched, each read takes one sample of the elapsed time and
+    count, and folds the rate since the previous read into the average, weighted by
+    the time between them, with the time constant `window`. So it only knows what
+    happened between reads: the first read returns the average of the whole history,
+    and the older history only fades away if it is read periodically, at intervals
+    well below `window`, e.g. by a monitoring thread or a `Reporter`.
+    """
+    __slots__ = ('window', '_lock', '_time', '_count', '_rate')
+
+    def __init__(self, window: float):
+        assert window > 0.
+        self.window = window
+        self._lock = threading.Lock()
+        self._time, self._count, self._rate = 0., 0, None
+
+    def update(self, handle) -> float:
+        """Take a sample of the handle, and return the current rate.
+
+        Args:
+            handle: the handle, with its duration and count
+
+        Returns:
+            the number of items per second.
+
+        """
+        with self._lock:  # the samples must be taken in order.
+            elapsed, count = handle.duration, handle.count
+            rate, dt = self._rate, elapsed - self._time
+            if rate is None or dt < 0.:  # the first read, or the iteration restarted.
+                rate = count / elapsed if elapsed > 0. else 0.
+            elif dt > 0.:
+                alpha = -math.expm1(-dt / self.window)
+                rate += alpha * ((count - self._count) / dt - rate)
+            self._time, self._count, self._rate = elapsed, count, rate
+            return rate
@@ -0,0 +1,187 @@
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+from .core import Handle
+from .human_count import HumanCount
+from .human_duration import HumanDuration
+from .human_throughput import HumanThroughput
+
+
+class Sample(object):
+    """A reading of a live handle, with the deltas since the previous one."""
+    __slots__ = ('name', 'unit', 'duration', 'count', 'delta_count', 'delta_seconds',
+                 'percent', 'eta', 'done')
+
+    def __init__(self, name: str, unit: str, duration: float, count: Optional[int],
+                 delta_count: int, delta_seconds: float, percent: Optional[float] = None,
+                 eta: Optional[HumanDuration] = None, done: bool = False):
+        self.name, self.unit = name, unit
+        self.duration = duration
+        self.count = count  # None for handles without a count, e.g. of context managers.
+        self.delta_count, self.delta_seconds = delta_count, delta_seconds
+        self.percent, self.eta = percent, eta
+        self.done = done
+
+    @property
+    def throughput(self) -> float:
+        """Return the throughput of the interval, in items per second."""
+        return self.delta_count / self.delta_seconds if self.delta_seconds else 0.
+
+    @property
+    def throughput_avg(self) -> float:
+        """Return the throughput of the whole duration, in items per second."""
+        return self.count / self.duration if self.count and self.duration else 0.
+
+    def __str__(self):
+        line = '{}: {}'.format(self.name, HumanDuration(self.duration))
+        if self.count is not None:
+            line += ', {} (+{}) at {} (avg {})'.format(
+                HumanCount(self.count, self.unit), HumanCount(self.delta_count, self.unit),
+                HumanThroughput(self.throughput, self.unit),
+                HumanThroughput(self.throughput_avg, self.unit))
+        if self.percent is not None:
+            line += ', {:.1f}%'.format(self.percent)
+        if self.done:
+            return line + ', done'
+        return line + (', eta {}'.format(self.eta) if self.eta is not None else '')
+
+    def __repr__(self):  # pragma: no cover
+        return 'Sample{{ name={!r} count={} delta_count={} }} -> {}'.format(
+            self.name, self.count, self.delta_count, self)
+
+
+class Reporter(object):
+    """Periodically read live handles from a background thread, and report their progress,
+    with the deltas of each interval.
+
+    The handles are only read, from their existing counters, so the timed code does not
+    pay anything extra. Each report is a list of `Sample`s, of the handles already
+    started, which is sent to `callback`, or printed one per line to `file` by default.
+
+    >>> with Reporter(interval=5.) as reporter:
+    ....    t = reporter.watch('rows', about_time(rows), 'rows')
+    ....    for row in t:
+    ....        process(row)
+    rows: 5s, 1.2Mrows (+1.2Mrows) at 243.1krows/s (avg 243.1krows/s), 12.3%, eta 0:35
+
+    Args:
+        interval: the number of seconds between reports
+        callback: the function to receive the samples of each report, instead of printing
+        file: where to print the samples, `sys.stderr` if None
+
+    """
+
+    def __init__(self, interval: float = 1.,
+                 callback: Optional[Callable[[List[Sample]], None]] = None,
+                 file: Optional[TextIO] = None):
+        assert interval > 0.
+        self.__interval = interval
+        self.__callback = callback
+        self.__file = file
+        self.__handles: Dict[str, Tuple[Handle, str]] = {}
+        self.__previous: Dict[str, Tuple[int, int]] = {}  # the count and duration in ns.
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+
+    def watch(self, name: str, handle: Handle, unit: str = '') -> Handle:
+        """Include a handle in the reports, replacing any other with the same name.
+
+        Args:
+            name: the name of the handle in the reports
+            handle: any handle, usually a live `HandleStats`
+            unit: what is being counted
+
+        Returns:
+            the very same handle, for convenience.
+
+        """
+        with self.__lock:
+            self.__handles[name] = handle, unit
+            self.__previous.pop(name, None)
+        return handle
+
+    def unwatch(self, name: str) -> None:
+        """Remove a handle from the reports."""
+        with self.__lock:
+            self.__handles.pop(name, None)
+            self.__previous.pop(name, None)
+
+    def sample(self) -> List[Sample]:
+        """Read all the handles already started, and compute the deltas since the previous
+        call. It is called periodically by the background thread, but can also be called
+        directly.
+
+        Returns:
+            the samples, in the order the handles were watched.
+
+        """
+        samples = []
+        with self.__lock:
+            for name, (handle, unit) in self.__handles.items():
+                if not handle._start:  # not started yet, e.g. an iterator not iterated.
+                    continue
+                done = bool(handle._end)
+                duration_ns, count = handle.duration_ns, getattr(handle, 'count', None)
+                last_count, last_ns = self.__previous.get(name, (0, 0))
+                if (count or 0) < last_count or duration_ns < last_ns:
+                    last_count, last_ns = 0, 0  # the handle restarted, e.g. iterated again.
+                self.__previous[name] = count or 0, duration_ns
+                percent = getattr(handle, 'percent', None)
+                eta = None if done or percent is None else handle.eta
+                samples.append(Sample(name, unit, duration_ns / 1e9, count,
+                                      (count or 0) - last_count, (duration_ns - last_ns) / 1e9,
+                                      percent, eta, done))
+        return samples
+
+    def report(self) -> None:
+        """Sample the handles, and send the samples to the callback or print them.
+        Errors of the callback are kept in `last_error`, and never raised.
+        """
+        samples = self.sample()
+        if not samples:
+            return
+        try:
+            if self.__callback is not None:
+                self.__callback(samples)
+            else:
+                file = self.__file or sys.stderr
+                file.write(''.join('{}\n'.format(s) for s in samples))
+                file.flush()
+        except Exception as e:
+            self.last_error = e
+
+    def start(self) -> 'Reporter':
+        """Start the background thread, which reports every `interval` seconds."""
+        if self.__thread is None:
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.__run, name='about_time.Reporter',
+                                             daemon=True)
+            self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread, and report for the last time."""
+        thread, self.__thread = self.__thread, None
+        if thread is not None:
+            self.__stop.set()
+            thread.join()
+        self.report()
+
+    def __run(self):
+        # the reports follow the clock, so the time spent reporting does not add up.
+        interval, deadline = self.__interval, time.monotonic()
+        while True:
+            deadline += interval
+            if self.__stop.wait(max(deadline - time.monotonic(), 0.)):
+                return
+            self.report()
+
+    def __enter__(self) -> 'Reporter':
+        return self.start()
+
+    def __exit__(self, *_exc):
+        self.stop()
@@ -0,0 +1,179 @@
+import inspect
+import math
+import random
+import threading
+import time
+from functools import wraps
+from itertools import count
+from typing import Callable, Optional, TypeVar
+
+from .human_count import HumanCount
+from .human_duration import HumanDuration
+from .human_throughput import HumanThroughput
+
+T = TypeVar('T')
+
+
+def timed(func: Optional[Callable[..., T]] = None, *, sample_rate: float = .01,
+          every: Optional[int] = None):
+    """Decorate a hot function to time only a sample of its calls, but count all of them.
+
+    The total time and throughput are extrapolated from the sampled calls, with an error
+    estimate, so it can be left enabled in production. The calls not sampled only pay
+    for counting and one comparison.
+
+    >>> @timed(sample_rate=.01)  # about 1% of the calls, randomly spaced.
+    ... def func(): ...
+    >>> @timed(every=100)  # exactly every 100th call.
+    ... def func(): ...
+    >>> print(func.stats)
+
+    Args:
+        func: the function, when used without arguments
+        sample_rate: the probability of timing each call
+        every: the interval of calls to time, instead of randomly
+
+    Returns:
+        the decorated function, with the statistics in `stats`.
+
+    """
+    if func is None:
+        return lambda f: timed(f, sample_rate=sample_rate, every=every)
+
+    if every is not None:
+        assert every >= 1
+
+        def gap():
+            return every
+    else:
+        assert 0. < sample_rate <= 1.
+        log_miss = math.log1p(-sample_rate) if sample_rate < 1. else -math.inf
+
+        def gap():  # geometric gaps, like sampling each call with the sample rate.
+            return int(math.log(1. - random.random()) / log_miss) + 1
+
+    calls, stats = count(1), SampledStats()
+    stats._calls = calls
+    next_sample = [gap()]
+
+    if inspect.iscoroutinefunction(func):  # times the awaiting, not the coroutine creation.
+        @wraps(func)
+        async def sampled(*args, **kwargs):
+            if next(calls) < next_sample[0]:
+                return await func(*args, **kwargs)
+            next_sample[0] += gap()
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                stats._add(time.perf_counter() - start)
+    else:
+        @wraps(func)
+        def sampled(*args, **kwargs):
+            if next(calls) < next_sample[0]:
+                return func(*args, **kwargs)
+            next_sample[0] += gap()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats._add(time.perf_counter() - start)
+
+    sampled.stats = stats
+    return sampled
+
+
+class SampledStats(object):
+    """The statistics of a `timed` function, extrapolated from its sampled calls."""
+
+    def __init__(self):
+        self._calls = count(1)
+        self._lock = threading.Lock()  # only taken on sampled calls.
+        self._n, self._mean, self._m2 = 0, 0., 0.
+        self._unit = ''
+
+    def unit(self, value: str) -> 'SampledStats':
+        self._unit = value
+        return self
+
+    def _add(self, duration: float) -> None:
+        with self._lock:  # Welford's online mean and variance.
+            self._n += 1
+            delta = duration - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (duration - self._mean)
+
+    @property
+    def calls(self) -> int:
+        """Return the number of calls, sampled or not."""
+        # `itertools.count` does not expose its state, but its repr does: "count(n)".
+        return int(repr(self._calls)[6:-1]) - 1
+
+    @property
+    def samples(self) -> int:
+        """Return the number of sampled calls."""
+        return self._n
+
+    @property
+    def mean(self) -> float:
+        """Return the mean duration of the sampled calls, in seconds."""
+        return self._mean
+
+    @property
+    def total(self) -> float:
+        """Return the estimated total duration of all calls, in seconds."""
+        return self._mean * self.calls
+
+    @property
+    def total_error(self) -> float:
+        """Return the 95% confidence margin of the estimated total, in seconds."""
+        n, calls = self._n, self.calls
+        if n >= calls:  # every call was timed, so the total is exact.
+            return 0.
+        if n < 2:
+            return float('inf')
+        # the standard error of the mean, with the finite population correction.
+        stderr = math.sqrt(self._m2 / (n - 1) / n * (1. - n / calls))
+        return 1.96 * stderr * calls
+
+    @property
+    def throughput(self) -> float:
+        """Return the estimated number of calls per second of work."""
+        return 1. / self._mean if self._mean else 0.
+
+    @property
+    def calls_human(self) -> HumanCount:
+        return HumanCount(self.calls, self._unit)
+
+    @property
+    def mean_human(self) -> HumanDuration:
+        return HumanDuration(self.mean)
+
+    @property
+    def total_human(self) -> HumanDuration:
+        return HumanDuration(self.total)
+
+    @property
+    def total_error_human(self) -> Optional[HumanDuration]:
+        """Return a beautiful representation of the 95% confidence margin.
+
+        Returns:
+            the human representation, or None if there are not enough samples yet.
+
+        """
+        error = self.total_error
+        return None if error == float('inf') else HumanDuration(error)
+
+    @property
+    def throughput_human(self) -> HumanThroughput:
+        return HumanThroughput(self.throughput, self._unit)
+
+    def __str__(self):
+        error = self.total_error_human
+        return '{} in ~{} ±{} (mean: {}, {} samples) -> {}'.format(
+            self.calls_human, self.total_human, '?' if error is None else error, self.mean_human,
+            HumanCount(self.samples, ''), self.throughput_human)
+
+    def __repr__(self):  # pragma: no cover
+        return 'SampledStats{{ calls={} samples={} mean={} }} -> {}'.format(
+            self.calls, self.samples, self.mean, self)
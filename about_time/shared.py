@@ -0,0 +1,197 @@
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+from .core import Handle, HandleStats
+
+FIELDS = 4  # per slot: pid, count, calls and busy seconds, all as float64.
+
+
+class SharedStats(object):
+    """Aggregate timings of several processes, through shared memory.
+
+    Each process claims its own slot in a shared array the first time it records
+    something, and from then on writes its counts and durations directly into it,
+    without pickling or IPC round-trips; the threads of a process share its slot,
+    under a lock of that process only. The creator can read the live aggregate at
+    any time, through `handle()`.
+
+    There must be a slot for each process alive at the same time, which by default fits
+    a pool of one worker per cpu. When a process dies, its slot is taken over by the next
+    new one, keeping its totals, so pools that recycle or respawn workers don't run out
+    of slots (except on Windows, where the dead processes are not detected).
+
+    Send it to the workers at creation, e.g. in `initargs` of a `ProcessPoolExecutor`
+    or in the `args` of a `Process`, since it carries a lock to claim the slots; if
+    they use a custom multiprocessing context, send it here too.
+
+    >>> with SharedStats() as shared:
+    ...     with ProcessPoolExecutor(initializer=init, initargs=(shared,)) as ex:
+    ...         ...  # and in each task: shared.add(about_time(...))
+    ...     print(shared.handle().throughput_human)
+    """
+
+    def __init__(self, slots: Optional[int] = None, context=None):
+        """Create the shared memory.
+
+        Args:
+            slots: the maximum number of processes alive at the same time, defaults to the
+                number of cpus + 1
+            context: an optional multiprocessing context, to create the lock
+
+        """
+        import multiprocessing
+        from multiprocessing import shared_memory
+
+        self.__slots = slots or (os.cpu_count() or 1) + 1
+        self.__shm = shared_memory.SharedMemory(create=True, size=self.__slots * FIELDS * 8)
+        self.__lock = (context or multiprocessing).Lock()
+        self.__timings = time.perf_counter_ns(), 0
+        self.__owner = os.getpid()  # forked children inherit this object, but do not own it.
+        self.__attach()
+
+    def __attach(self):
+        self.__data = self.__shm.buf.cast('d')
+        self.__pid, self.__offset, self.__thread_lock = None, None, None
+        self.__handle = SharedHandle(self.__timings, self)
+
+    def __getstate__(self):
+        return self.__shm.name, self.__slots, self.__lock, self.__timings
+
+    def __setstate__(self, state):
+        name, self.__slots, self.__lock, self.__timings = state
+        self.__shm = _attach_shared_memory(name)
+        self.__owner = None
+        self.__attach()
+
+    def __slot(self) -> int:
+        pid = os.getpid()
+        if pid == self.__pid:
+            return self.__offset
+        data = self.__data
+        with self.__lock:
+            if pid != self.__pid:  # another thread of this process may have just claimed it.
+                offsets = range(0, self.__slots * FIELDS, FIELDS)
+                offset = next((o for o in offsets if data[o] in (0., pid)), None)
+                if offset is None:  # the slot of a dead process is taken over, with its totals.
+                    offset = next((o for o in offsets if not _alive(int(data[o]))), None)
+                    if offset is None:
+                        raise RuntimeError('all {} slots are taken.'.format(self.__slots))
+                data[offset] = pid
+                # a new lock, since one inherited by forking might be held by a dead thread.
+                self.__thread_lock = threading.Lock()
+                self.__offset = offset
+                self.__pid = pid  # the last one, as it enables the fast path above.
+        return self.__offset
+
+    def record(self, duration: float, count: int = 1) -> None:
+        """Record a timing into the slot of the current process.
+
+        Args:
+            duration: the number of seconds
+            count: the number of items processed in it
+
+        """
+        offset, data = self.__slot(), self.__data
+        with self.__thread_lock:  # the increments are not atomic.
+            data[offset + 1] += count
+            data[offset + 2] += 1
+            data[offset + 3] += duration
+
+    def add(self, handle: Handle) -> None:
+        """Record a finished handle into the slot of the current process.
+        The count of a `HandleStats` is included, other handles count as one item.
+
+        Args:
+            handle: any handle
+
+        """
+        self.record(handle.duration, getattr(handle, 'count', 1))
+
+    def __totals(self, field: int) -> float:
+        data = self.__data
+        return sum(data[offset + field] for offset in range(0, self.__slots * FIELDS, FIELDS))
+
+    @property
+    def count(self) -> int:
+        """Return the total count of all processes."""
+        return int(self.__totals(1))
+
+    @property
+    def calls(self) -> int:
+        """Return the total number of timings recorded by all processes."""
+        return int(self.__totals(2))
+
+    @property
+    def busy(self) -> float:
+        """Return the sum of the durations recorded by all processes."""
+        return self.__totals(3)
+
+    @property
+    def workers(self) -> int:
+        """Return the number of slots used, i.e. of processes that recorded something,
+        except for the dead ones whose slots were taken over."""
+        return sum(1 for offset in range(0, self.__slots * FIELDS, FIELDS)
+                   if self.__data[offset])
+
+    def handle(self) -> 'SharedHandle':
+        """Return a live view of the aggregate of all processes.
+
+        Its count is the total count, and its duration is the wall time since this
+        was created until `stop()`, so its throughput is the aggregate throughput.
+
+        Returns:
+            the handle.
+
+        """
+        return self.__handle
+
+    def stop(self) -> None:
+        """Stop the clock of the aggregate handle."""
+        self.__timings = self.__timings[0], time.perf_counter_ns()
+        self.__handle._end = self.__timings[1]
+
+    def close(self) -> None:
+        """Release the shared memory of this process, and destroy it if this is the creator."""
+        self.__data.release()
+        self.__shm.close()
+        if self.__owner == os.getpid():
+            self.__shm.unlink()
+
+    def __enter__(self) -> 'SharedStats':
+        return self
+
+    def __exit__(self, *_exc):
+        self.stop()
+        self.close()
+
+
+class SharedHandle(HandleStats):
+    """The live view of the aggregate of a `SharedStats`, with all the fields of a
+    `HandleStats`, but which is not iterable, since the items were iterated elsewhere."""
+    __slots__ = ()
+    __iter__ = __aiter__ = None  # marks it as not iterable.
+
+
+def _alive(pid: int) -> bool:
+    if os.name == 'nt':  # pragma: no cover
+        return True  # there, `os.kill` would terminate it.
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # it exists, but belongs to another user.
+        pass
+    return True
+
+
+def _attach_shared_memory(name):
+    from multiprocessing import shared_memory
+
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        return shared_memory.SharedMemory(name, track=False)
+    # before 3.13 attaching also registers it in the resource tracker, which is harmless
+    # since processes started by multiprocessing share the tracker of their parent.
+    return shared_memory.SharedMemory(name)  # pragma: no cover
@@ -0,0 +1,221 @@
+import time
+from typing import Iterator, Optional
+
+from .core import Handle, nbytes
+from .features import IEC
+from .human_count import HumanCount
+from .human_duration import HumanDuration
+from .human_throughput import HumanThroughput
+
+
+def timed_io(raw) -> 'TimedIO':
+    """Wrap a binary file object or socket, to measure the bytes it transfers and the
+    time spent inside the actual I/O calls, apart from the time spent in your code.
+
+    The proxy times `read`, `readinto`, `readline` and `write` of files, and `recv`,
+    `recv_into`, `send` and `sendall` of sockets; everything else goes straight to the
+    wrapped object. The bytes are counted from the return values, so nothing is ever
+    copied, and with `readinto` or `recv_into` into a preallocated buffer the measuring
+    allocates nothing either.
+
+    >>> with timed_io(open('data.bin', 'rb')) as f:
+    ...     while f.readinto(buffer):
+    ...         process(buffer)
+    >>> print(f.io_ratio)  # near 1 if the stage is I/O bound, near 0 if compute bound.
+
+    The clock starts when wrapping, and stops when closing it, or when exiting the
+    context, which also closes the wrapped object, like files do.
+
+    Args:
+        raw: the binary file object or socket
+
+    Returns:
+        the proxy, which is also the handle with the statistics.
+
+    """
+    return TimedIO(raw)
+
+
+class TimedIO(Handle):
+    """The proxy of a binary file object or socket, with the statistics of its I/O."""
+    __slots__ = ('__raw', 'bytes_read', 'bytes_written', 'calls', 'io_ns')
+
+    def __init__(self, raw):
+        super(TimedIO, self).__init__((time.perf_counter_ns(), 0))
+        self.__raw = raw
+        self.bytes_read, self.bytes_written, self.calls, self.io_ns = 0, 0, 0, 0
+
+    @property
+    def raw(self):
+        """Return the wrapped file object or socket."""
+        return self.__raw
+
+    def __getattr__(self, name):
+        # the special names are not forwarded, so the protocols like copy and pickle
+        # find the ones of the proxy itself, which Python < 3.11 looks up in here.
+        if name.startswith('__') and name.endswith('__') or name == '_TimedIO__raw':
+            raise AttributeError(name)
+        return getattr(self.__raw, name)
+
+    def __enter__(self) -> 'TimedIO':
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+    def close(self) -> None:
+        self.__raw.close()
+        self._end = self._end or time.perf_counter_ns()
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.readline, b'')
+
+    # the time of the calls that raise counts too, e.g. blocked until a socket timeout.
+    def __read(self, func, *args):
+        start = time.perf_counter_ns()
+        try:
+            data = func(*args)
+        finally:
+            self.io_ns += time.perf_counter_ns() - start
+            self.calls += 1
+        if data:  # None means no data available yet, on non-blocking streams.
+            self.bytes_read += len(data)
+        return data
+
+    def __into(self, func, buffer, *args):
+        start = time.perf_counter_ns()
+        try:
+            n = func(buffer, *args)
+        finally:
+            self.io_ns += time.perf_counter_ns() - start
+            self.calls += 1
+        if n:
+            self.bytes_read += n
+        return n
+
+    def __write(self, func, data, *args):
+        start = time.perf_counter_ns()
+        try:
+            n = func(data, *args)
+        finally:
+            self.io_ns += time.perf_counter_ns() - start
+            self.calls += 1
+        if n:  # None means it would block, on non-blocking streams.
+            self.bytes_written += n
+        return n
+
+    def read(self, size: int = -1) -> Optional[bytes]:
+        return self.__read(self.__raw.read, size)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self.__read(self.__raw.readline, size)
+
+    def readinto(self, buffer) -> Optional[int]:
+        return self.__into(self.__raw.readinto, buffer)
+
+    def write(self, data) -> Optional[int]:
+        return self.__write(self.__raw.write, data)
+
+    def recv(self, size: int, *flags) -> bytes:
+        return self.__read(self.__raw.recv, size, *flags)
+
+    def recv_into(self, buffer, *args) -> int:
+        return self.__into(self.__raw.recv_into, buffer, *args)
+
+    def send(self, data, *flags) -> int:
+        return self.__write(self.__raw.send, data, *flags)
+
+    def sendall(self, data, *flags) -> None:
+        self.__write(self.__raw.sendall, data, *flags)
+        self.bytes_written += nbytes(data)  # it returns None, but either sends all or raises.
+
+    @property
+    def count(self) -> int:
+        """Return the number of bytes transferred, both read and written.
+        This is dynamically updated in real time.
+
+        Returns:
+            the number of bytes.
+
+        """
+        return self.bytes_read + self.bytes_written
+
+    @property
+    def count_bytes_human(self) -> HumanCount:
+        """Return a beautiful representation of the bytes transferred, in IEC units.
+
+        Returns:
+            the human representation.
+
+        """
+        return HumanCount(self.count, 'B', IEC)
+
+    @property
+    def io_time(self) -> float:
+        """Return the number of seconds spent inside the I/O calls."""
+        return self.io_ns / 1e9
+
+    @property
+    def io_time_human(self) -> HumanDuration:
+        return HumanDuration(self.io_time)
+
+    @property
+    def other_time(self) -> float:
+        """Return the number of seconds spent outside the I/O calls, i.e. in your code."""
+        return max(self.duration_ns - self.io_ns, 0) / 1e9
+
+    @property
+    def other_time_human(self) -> HumanDuration:
+        return HumanDuration(self.other_time)
+
+    @property
+    def io_ratio(self) -> float:
+        """Return the fraction of the duration spent inside the I/O calls, from 0 to 1.
+
+        Returns:
+            near 1 if I/O bound, near 0 if compute bound.
+
+        """
+        duration = self.duration_ns
+        return min(self.io_ns / duration, 1.) if duration else 0.
+
+    @property
+    def throughput(self) -> float:
+        """Return the bytes transferred per second of the whole duration.
+
+        Returns:
+            the number of bytes per second.
+
+        """
+        duration = self.duration
+        return self.count / duration if duration else 0.
+
+    @property
+    def throughput_bytes_human(self) -> HumanThroughput:
+        return HumanThroughput(self.throughput, 'B', IEC)
+
+    @property
+    def io_throughput(self) -> float:
+        """Return the bytes transferred per second spent inside the I/O calls, i.e. how
+        fast the device or network was, regardless of your code.
+
+        Returns:
+            the number of bytes per second.
+
+        """
+        io_time = self.io_time
+        return self.count / io_time if io_time else 0.
+
+    @property
+    def io_throughput_bytes_human(self) -> HumanThroughput:
+        return HumanThroughput(self.io_throughput, 'B', IEC)
+
+    def __str__(self):
+        return '{} in {} calls, io: {} ({:.0%}), other: {} -> {} (io: {})'.format(
+            self.count_bytes_human, self.calls, self.io_time_human, self.io_ratio,
+            self.other_time_human, self.throughput_bytes_human,
+            self.io_throughput_bytes_human)
+
+    def __repr__(self):  # pragma: no cover
+        return 'TimedIO{{ raw={!r} count={} io_ns={} }} -> {}'.format(
+            self.__raw, self.count, self.io_ns, self)
@@ -0,0 +1,246 @@
+import inspect
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, TypeVar
+
+from .human_count import HumanCount
+from .human_duration import HumanDuration
+from .human_throughput import HumanThroughput
+
+T = TypeVar('T')
+
+_TIMERS: Dict[str, 'Timer'] = {}
+_TIMERS_LOCK = threading.Lock()
+
+
+def timer(name: str) -> 'Timer':
+    """Get the named timer, creating it on the first use.
+
+    The same timer can be used from any number of threads, each one accumulates
+    into its own shard, so hot threads never contend on a lock. It also works with
+    concurrent asyncio tasks, and decorating coroutine functions times their awaiting.
+
+    >>> with timer('db.query'):
+    ....    # code block.
+
+    >>> @timer('db.query')
+    ... def query(): ...
+
+    Args:
+        name: the name of the timer
+
+    Returns:
+        the timer.
+
+    """
+    try:
+        return _TIMERS[name]
+    except KeyError:
+        with _TIMERS_LOCK:
+            return _TIMERS.setdefault(name, Timer(name))
+
+
+def timers() -> Dict[str, 'Timer']:
+    """Return all the named timers, by name."""
+    return dict(_TIMERS)
+
+
+def report_timers(unit: str = '') -> str:
+    """Return a report of all the named timers, one per line, sorted by name.
+
+    Args:
+        unit: what is being measured, for the counts and throughputs
+
+    Returns:
+        the human friendly report.
+
+    """
+    return '\n'.join(str(t.stats().unit(unit)) for _, t in sorted(_TIMERS.items()))
+
+
+class _Shard(object):
+    """The accumulators of one thread, in ns, which are only ever written by that thread."""
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.count, self.total, self.min, self.max = 0, 0, -1, 0  # -1: no timings yet.
+
+    def add(self, duration_ns: int) -> None:
+        self.total += duration_ns
+        if duration_ns < self.min or self.min < 0:
+            self.min = duration_ns
+        if duration_ns > self.max:
+            self.max = duration_ns
+        self.count += 1  # the last one, so concurrent readers never see a count without min.
+
+    def merge(self, other: '_Shard') -> None:
+        if other.count:
+            self.count += other.count
+            self.total += other.total
+            self.min = other.min if self.min < 0 else min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+
+class _Owner(object):
+    """The handle of a shard in the thread local storage, which dies with the thread."""
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self, shard: _Shard):
+        self.shard = shard
+
+
+class Timer(object):
+    """A named timer, which accumulates the count, total, min and max of its timings.
+
+    Each thread accumulates into its own shard, and the shards are only merged when
+    someone reads the statistics, or when their threads end.
+    """
+
+    def __init__(self, name: str):
+        self.__name = name
+        self.__local = threading.local()
+        self.__shards = []
+        self.__ended = _Shard()  # the merged shards of the threads that ended.
+        self.__lock = threading.Lock()  # only used when threads start or end, and on reads.
+        # the starts of the running blocks, a stack to support nesting the same timer. It is
+        # in a context variable, so each thread and each asyncio task has its own.
+        self.__starts = ContextVar('about_time.timer:{}'.format(name), default=())
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def __shard(self) -> _Shard:
+        try:
+            return self.__local.owner.shard
+        except AttributeError:
+            shard = _Shard()
+            owner = self.__local.owner = _Owner(shard)
+            with self.__lock:
+                self.__shards.append(shard)
+            # the thread local storage is dropped when the thread ends, so the shards of
+            # short-lived threads don't pile up.
+            weakref.finalize(owner, self.__end, shard)
+            return shard
+
+    def __end(self, shard: _Shard) -> None:
+        with self.__lock:
+            self.__shards.remove(shard)
+            self.__ended.merge(shard)
+
+    def __enter__(self) -> 'Timer':
+        self.__starts.set(self.__starts.get() + (time.perf_counter_ns(),))
+        return self
+
+    def __exit__(self, *_exc):
+        end = time.perf_counter_ns()
+        starts = self.__starts.get()
+        self.__starts.set(starts[:-1])
+        self.__shard().add(end - starts[-1])
+
+    def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def timed_async(*args, **kwargs):
+                with self:
+                    return await func(*args, **kwargs)
+
+            return timed_async
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+
+        return timed
+
+    def record(self, duration: float) -> None:
+        """Record an externally measured duration, e.g. from a `Handle`.
+
+        Args:
+            duration: the number of seconds
+
+        """
+        self.__shard().add(round(duration * 1e9))
+
+    def stats(self) -> 'TimerStats':
+        """Merge the shards of all threads into a snapshot of the statistics.
+
+        Returns:
+            the statistics.
+
+        """
+        merged = _Shard()
+        with self.__lock:  # so a shard being merged into the ended ones isn't counted twice.
+            merged.merge(self.__ended)
+            for shard in self.__shards:
+                merged.merge(shard)
+        return TimerStats(self.__name, merged.count, merged.total / 1e9,
+                          max(merged.min, 0) / 1e9, merged.max / 1e9)
+
+    def __repr__(self):  # pragma: no cover
+        return 'Timer{{ name={!r} }} -> {}'.format(self.__name, self.stats())
+
+
+class TimerStats(object):
+    """A snapshot of the statistics of a named timer."""
+
+    def __init__(self, name: str, count: int, total: float, low: float, high: float):
+        self.name = name
+        self.count = count
+        self.total = total
+        self.min = low
+        self.max = high
+        self._unit = ''
+
+    def unit(self, value: str) -> 'TimerStats':
+        self._unit = value
+        return self
+
+    @property
+    def mean(self) -> float:
+        """Return the mean duration in seconds."""
+        return self.total / self.count if self.count else 0.
+
+    @property
+    def throughput(self) -> float:
+        """Return the number of timings per second of timed work.
+        With several threads, this can be higher than the wall time throughput.
+        """
+        return self.count / self.total if self.total else 0.
+
+    @property
+    def count_human(self) -> HumanCount:
+        return HumanCount(self.count, self._unit)
+
+    @property
+    def total_human(self) -> HumanDuration:
+        return HumanDuration(self.total)
+
+    @property
+    def mean_human(self) -> HumanDuration:
+        return HumanDuration(self.mean)
+
+    @property
+    def min_human(self) -> HumanDuration:
+        return HumanDuration(self.min)
+
+    @property
+    def max_human(self) -> HumanDuration:
+        return HumanDuration(self.max)
+
+    @property
+    def throughput_human(self) -> HumanThroughput:
+        return HumanThroughput(self.throughput, self._unit)
+
+    def __str__(self):
+        return '{}: {} in {} (mean: {}, min: {}, max: {}) -> {}'.format(
+            self.name, self.count_human, self.total_human, self.mean_human, self.min_human,
+            self.max_human, self.throughput_human)
+
+    def __repr__(self):  # pragma: no cover
+        return 'TimerStats{{ name={!r} count={} total={} }} -> {}'.format(
+            self.name, self.count, self.total, self)
@@ -0,0 +1,181 @@
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Tuple
+
+from .core import _Timing
+from .human_count import HumanCount
+from .human_duration import HumanDuration
+
+_CURRENT = ContextVar('about_time_span', default=None)  # the active span.
+_LOCK = threading.Lock()
+_INVALID = re.compile(r'[;\s]')  # would corrupt the collapsed stacks.
+
+
+def span(name: str) -> '_SpanTiming':
+    """Measure a code block as a span, nested in the span that is active in the current
+    thread or asyncio task, if any.
+
+    All the spans are aggregated by their path into one tree, with their count, total
+    time and self time, i.e. the time not spent in any child span.
+
+    >>> with span('request'):
+    ....    with span('db'):
+    ....        # code block.
+    ....    with span('render'):
+    ....        # code block.
+    >>> print(report_spans())
+
+    Args:
+        name: the name of the span, without any ";" or whitespace
+
+    Returns:
+        the handle of this span, which is also its context manager, both sync and async.
+
+    Raises:
+        ValueError: if the name is empty, or has any ";" or whitespace.
+
+    """
+    if not name or _INVALID.search(name):
+        raise ValueError('invalid span name: {!r}'.format(name))
+    return _SpanTiming(name)
+
+
+def spans() -> 'SpanStats':
+    """Return the root of the tree of spans, whose children are the outermost spans."""
+    return _ROOT
+
+
+def reset_spans() -> None:
+    """Discard the whole tree of spans."""
+    global _ROOT
+    _ROOT = SpanStats('')
+
+
+def report_spans() -> str:
+    """Return a report of the tree of spans, one per line, indented by depth.
+
+    Returns:
+        the human friendly report.
+
+    """
+    return '\n'.join('{}{}'.format('  ' * (len(path) - 1), stats)
+                     for path, stats in _ROOT.walk())
+
+
+def collapsed_spans() -> str:
+    """Return the tree of spans in the collapsed stack format of flamegraph tools, one
+    path per line with its self time in nanoseconds, e.g. "request;db 1200000".
+
+    Returns:
+        the collapsed stacks.
+
+    """
+    return '\n'.join('{} {}'.format(';'.join(path), stats.self_ns)
+                     for path, stats in _ROOT.walk())
+
+
+class SpanStats(object):
+    """The aggregated statistics of all the spans with the same path."""
+    __slots__ = ('name', 'count', 'total_ns', 'self_ns', 'children')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count, self.total_ns, self.self_ns = 0, 0, 0
+        self.children: Dict[str, SpanStats] = {}
+
+    def child(self, name: str) -> 'SpanStats':
+        try:
+            return self.children[name]
+        except KeyError:
+            with _LOCK:
+                return self.children.setdefault(name, SpanStats(name))
+
+    def add(self, total_ns: int, self_ns: int) -> None:
+        with _LOCK:
+            self.count += 1
+            self.total_ns += total_ns
+            self.self_ns += self_ns
+
+    def walk(self, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], 'SpanStats']]:
+        """Yield all the descendants in depth-first order, with their paths."""
+        with _LOCK:
+            children: List[SpanStats] = list(self.children.values())
+        for stats in children:
+            sub = path + (stats.name,)
+            yield sub, stats
+            yield from stats.walk(sub)
+
+    @property
+    def total(self) -> float:
+        return self.total_ns / 1e9
+
+    @property
+    def self_time(self) -> float:
+        return self.self_ns / 1e9
+
+    @property
+    def count_human(self) -> HumanCount:
+        return HumanCount(self.count, '')
+
+    @property
+    def total_human(self) -> HumanDuration:
+        return HumanDuration(self.total)
+
+    @property
+    def self_human(self) -> HumanDuration:
+        return HumanDuration(self.self_time)
+
+    def __str__(self):
+        return '{}: {} in {} (self: {})'.format(
+            self.name, self.count_human, self.total_human, self.self_human)
+
+    def __repr__(self):  # pragma: no cover
+        return 'SpanStats{{ name={!r} count={} total_ns={} }} -> {}'.format(
+            self.name, self.count, self.total_ns, self)
+
+
+_ROOT = SpanStats('')
+
+
+class _SpanTiming(_Timing):
+    """The handle of a span, which links itself to the active span while running."""
+    __slots__ = ('__name', '__parent', '__token', '__child_ns')
+
+    def __init__(self, name: str):
+        super(_SpanTiming, self).__init__((0, 0))
+        self.__name = name
+        self.__parent = self.__token = None
+        self.__child_ns = 0
+
+    def __enter__(self) -> '_SpanTiming':
+        self.__parent = _CURRENT.get()
+        self.__token = _CURRENT.set(self)
+        self.__child_ns = 0
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_exc):
+        self._end = time.perf_counter_ns()
+        try:
+            _CURRENT.reset(self.__token)
+        except ValueError:  # exited in another context, e.g. a generator resumed elsewhere.
+            _CURRENT.set(self.__parent)
+
+        total, path, parent = self._end - self._start, [self.__name], self.__parent
+        while parent:
+            path.append(parent.__name)
+            parent = parent.__parent
+        stats = _ROOT
+        for name in reversed(path):
+            stats = stats.child(name)
+        # concurrent child tasks can overlap, so their sum may exceed the parent's time.
+        stats.add(total, max(total - self.__child_ns, 0))
+        if self.__parent:
+            self.__parent.__child_ns += total
+            self.__parent = None  # do not keep the whole chain alive.
+
+    @property
+    def name(self) -> str:
+        return self.__name
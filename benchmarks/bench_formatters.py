@@ -0,0 +1,45 @@
+"""Throughput of the `as_human()` formatting, before and after caching the compiled formatters.
+
+Run with `python -m benchmarks.bench_formatters [number of calls]`.
+"""
+import sys
+import timeit
+
+from about_time import FEATURES, HumanCount, HumanDuration, HumanThroughput
+from about_time.human_count import fn_human_count
+from about_time.human_duration import fn_human_duration
+from about_time.human_throughput import fn_human_throughput
+
+
+def bench(title, func, n):
+    best = min(timeit.repeat(func, number=n, repeat=5))
+    print('{:>42}: {} per call, {}'.format(title, HumanDuration(best / n),
+                                           HumanThroughput(n / best, '')))
+
+
+def main(n):
+    f = FEATURES
+    count, duration, throughput = HumanCount(1825100., 'B'), HumanDuration(.0141233), \
+        HumanThroughput(3 / 1600., 'B')
+
+    bench('count: rebuilding the formatter (before)', lambda: fn_human_count(
+        f.feature_space, f.feature_1024, f.feature_iec)(1825100., 'B', None), n)
+    bench('count: as_human() (after)', count.as_human, n)
+    fmt = HumanCount.formatter()
+    bench('count: reused formatter', lambda: fmt(1825100., 'B'), n)
+
+    bench('duration: rebuilding the formatter (before)', lambda: fn_human_duration(
+        f.feature_space)(.0141233, None), n)
+    bench('duration: as_human() (after)', duration.as_human, n)
+    fmt = HumanDuration.formatter()
+    bench('duration: reused formatter', lambda: fmt(.0141233), n)
+
+    bench('throughput: rebuilding the formatter (before)', lambda: fn_human_throughput(
+        f.feature_space, f.feature_1024, f.feature_iec)(3 / 1600., 'B', None), n)
+    bench('throughput: as_human() (after)', throughput.as_human, n)
+    fmt = HumanThroughput.formatter()
+    bench('throughput: reused formatter', lambda: fmt(3 / 1600., 'B'), n)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,70 @@
+"""Memory and creation throughput of handles and human objects.
+
+Run with `python -m benchmarks.bench_handles [number of objects]`.
+"""
+import sys
+import time
+import timeit
+import tracemalloc
+
+from about_time import HumanCount, HumanDuration, HumanThroughput, about_time
+from about_time.core import HandleResult
+
+
+class LegacyHandle(object):
+    """The previous representation, with a `__dict__` and a two-element timings list."""
+
+    def __init__(self, timings, result):
+        self.__timings = timings
+        self.__result = result
+
+
+def legacy_handle_result():
+    timings = [time.perf_counter(), 0.]
+    result = None
+    timings[1] = time.perf_counter()
+    return LegacyHandle(timings, result)
+
+
+def bytes_per_object(factory, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / n - 8  # discounts the list pointer to each object.
+
+
+def noop():
+    pass
+
+
+def context():
+    with about_time() as t:
+        pass
+    return t
+
+
+CASES = (
+    ('legacy HandleResult', legacy_handle_result),
+    ('HandleResult', lambda: HandleResult((time.perf_counter(), time.perf_counter()), None)),
+    ('about_time(func)', lambda: about_time(noop)),
+    ('context manager Handle', context),
+    ('HandleStats', lambda: about_time(())),
+    ('HumanCount', lambda: HumanCount(1., 'B')),
+    ('HumanDuration', lambda: HumanDuration(1.)),
+    ('HumanThroughput', lambda: HumanThroughput(1., 'B')),
+)
+
+
+def main(n):
+    for title, factory in CASES:
+        size = bytes_per_object(factory, n)
+        best = min(timeit.repeat(factory, number=n, repeat=5))
+        print('{:>24}: {:>6.1f} bytes, {} to create, {}'.format(
+            title, size, HumanDuration(best / n), HumanThroughput(n / best, '')))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,45 @@
+"""Import time of about_time, measured with `python -X importtime`.
+
+Run with `python -m benchmarks.bench_import [--runs N] [--max-ms MS]`; it exits with an
+error if the median import time is above `--max-ms`, to guard against regressions.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+from about_time import HumanDuration
+
+
+def import_times(statement):
+    """Return the cumulative import time of each module imported by a statement, in us."""
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                         check=True, capture_output=True, text=True).stderr
+    times = {}
+    for line in err.splitlines()[1:]:  # skips the header.
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(runs, max_ms):
+    statement = 'import about_time'
+    samples = [import_times(statement) for _ in range(runs)]
+    median = statistics.median(s['about_time'] for s in samples) / 1e6
+    print('{}: {} (median of {} runs)'.format(statement, HumanDuration(median), runs))
+    interpreter = import_times('pass')
+    own = sorted((kv for kv in samples[-1].items() if kv[0] not in interpreter),
+                 key=lambda kv: -kv[1])
+    for name, us in own:  # only the modules imported because of about_time.
+        print('  {:>10}  {}'.format(str(HumanDuration(us / 1e6)), name))
+    if max_ms is not None and median * 1e3 > max_ms:
+        sys.exit('import time regressed: {} > {}'.format(HumanDuration(median),
+                                                         HumanDuration(max_ms / 1e3)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--max-ms', type=float)
+    args = parser.parse_args()
+    main(args.runs, args.max_ms)
@@ -0,0 +1,65 @@
+"""Per-item overhead of the counter/throughput mode, compared to a bare `for` loop.
+
+Run with `python -m benchmarks.bench_iterator [number of items]`.
+"""
+import sys
+import time
+import timeit
+from contextlib import contextmanager
+from itertools import repeat
+
+from about_time import HumanDuration, about_time
+
+
+@contextmanager
+def _context_timing(timings):
+    timings[0] = time.perf_counter()
+    yield
+    timings[1] = time.perf_counter()
+
+
+def legacy_about_time(it):
+    """The previous implementation, which stored the count on every element."""
+    timings = [0.0, 0.0]
+
+    def it_closure():
+        with _context_timing(timings):
+            for it_closure.count, elem in enumerate(it, 1):
+                yield elem
+
+    it_closure.count = 0
+    return it_closure
+
+
+def bare(n):
+    for _ in repeat(None, n):
+        pass
+
+
+def legacy(n):
+    for _ in legacy_about_time(repeat(None, n))():
+        pass
+
+
+def current(n):
+    for _ in about_time(repeat(None, n)):
+        pass
+
+
+def batched(n):
+    for _ in about_time(repeat((None,) * 100, n // 100), batched=True):
+        pass
+
+
+def main(n):
+    base = min(timeit.repeat(lambda: bare(n), number=1, repeat=5))
+    print('{:>8}: {} per item'.format('bare', HumanDuration(base / n)))
+    for func in legacy, current, batched:
+        best = min(timeit.repeat(lambda: func(n), number=1, repeat=5))
+        overhead = max(best - base, 0.) / n
+        print('{:>8}: {} per item, {} overhead per item'
+              .format(func.__name__, HumanDuration(best / n), HumanDuration(overhead)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,158 @@
+"""The benchmark suite of the hot paths, with JSON baselines and regression gating.
+
+It measures the per-item overhead of the iterator mode, the per-call overhead of the
+callable and context manager modes, the cost of allocating handles, and the throughput
+of `as_human()` of each Human class across all the `FEATURES` combinations.
+
+Run with `python -m benchmarks.suite [--save] [--baseline PATH] [--threshold 0.2] [-k TEXT]`.
+With `--save`, the results are stored as the new baseline; otherwise they are compared to
+the baseline if it exists, and it exits with an error if any case got slower than the
+threshold allows. Baselines are machine specific, so save one on the machine that gates.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from itertools import repeat
+
+from about_time import FEATURES, HumanCount, HumanDuration, HumanThroughput, about_time
+from about_time.core import HandleResult, HandleStats, _Timing
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+ITEMS = 100_000
+
+
+def noop():
+    pass
+
+
+def iterate(it):
+    for _ in it:
+        pass
+
+
+def context():
+    with about_time():
+        pass
+
+
+def core_cases():
+    """Yield the cases of the core, as (name, statement, number of operations)."""
+    yield 'iterator.bare_loop', lambda: iterate(repeat(None, ITEMS)), ITEMS
+    yield 'iterator.per_item', lambda: iterate(about_time(repeat(None, ITEMS))), ITEMS
+    yield 'iterator.per_item_batched', lambda: iterate(
+        about_time(repeat((None,) * 10, ITEMS // 10), batched=True)), ITEMS
+    yield 'iterator.per_item_histogram', lambda: iterate(
+        about_time(repeat(None, ITEMS), histogram=True)), ITEMS
+    yield 'callable.per_call', lambda: about_time(noop), 1
+    yield 'context.per_call', context, 1
+    yield 'handle.alloc_timing', lambda: _Timing((0, 0)), 1
+    yield 'handle.alloc_result', lambda: HandleResult((0, 0), None), 1
+    yield 'handle.alloc_stats', lambda: HandleStats((0, 0), noop), 1
+
+
+COMBINATIONS = (  # iec implies 1024.
+    (False, False, False), (True, False, False), (False, True, False),
+    (True, True, False), (False, True, True), (True, True, True),
+)
+
+
+def human_cases():
+    """Yield the cases of the formatters, across all the features combinations.
+    Each operation formats values of all scales, from tiny to huge."""
+    counts = [HumanCount(10. ** e * 1.23, 'B') for e in range(-3, 27, 3)]
+    durations = [HumanDuration(10. ** e * 1.23) for e in range(-9, 5)]
+    throughputs = [HumanThroughput(10. ** e * 1.23, 'B') for e in range(-6, 12, 2)]
+
+    def format_all(objects):
+        return lambda: [o.as_human() for o in objects]
+
+    for space, k, iec in COMBINATIONS:
+        features = 'space={:d},1024={:d},iec={:d}'.format(space, k, iec)
+        setup = (space, k, iec)
+        yield 'human.count[{}]'.format(features), format_all(counts), len(counts), setup
+        yield 'human.throughput[{}]'.format(features), format_all(throughputs), \
+            len(throughputs), setup
+        if not k:  # durations only depend on the space.
+            yield 'human.duration[space={:d}]'.format(space), format_all(durations), \
+                len(durations), setup
+
+
+def set_features(space, k, iec):
+    FEATURES.feature_space, FEATURES.feature_iec, FEATURES.feature_1024 = space, iec, k
+
+
+def measure(func, ops, repeats):
+    """Return the best number of seconds per operation, auto-ranging the number of runs."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeats, number=number)) / number / ops
+
+
+def run(pattern, repeats):
+    results = {}
+    saved = FEATURES.feature_space, FEATURES.feature_1024, FEATURES.feature_iec
+    try:
+        cases = [c + ((False, False, False),) for c in core_cases()] + list(human_cases())
+        for name, func, ops, features in cases:
+            if pattern and pattern not in name:
+                continue
+            set_features(*features)
+            results[name] = measure(func, ops, repeats)
+    finally:
+        set_features(saved[0], saved[1], saved[2])
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the results against the baseline, and return the names of the regressions."""
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if not base:  # a zero baseline was too fast to measure, so it can't gate either.
+            change, mark = '(new)' if base is None else '(no baseline)', ''
+        else:
+            ratio = seconds / base
+            change = '{:+6.1%}'.format(ratio - 1.)
+            mark = ' <-- REGRESSION' if ratio > 1. + threshold else ''
+            if mark:
+                regressions.append(name)
+        print('{:>42}: {:>9} per op  {}{}'.format(
+            name, str(HumanDuration(seconds)), change, mark))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=BASELINE, help='the JSON file of the baseline')
+    parser.add_argument('--save', action='store_true', help='store the results as baseline')
+    parser.add_argument('--threshold', type=float, default=.2,
+                        help='the tolerated slowdown, 0.2 means 20%% slower')
+    parser.add_argument('--repeat', type=int, default=5, help='the repetitions of each case')
+    parser.add_argument('-k', dest='pattern', help='only run the cases containing this text')
+    args = parser.parse_args()
+
+    results = run(args.pattern, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        if os.path.exists(args.baseline):  # keeps the cases not run this time.
+            with open(args.baseline) as f:
+                results = dict(json.load(f), **results)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('baseline saved to {}'.format(args.baseline))
+    elif regressions:
+        sys.exit('{} regressions above {:.0%}: {}'.format(
+            len(regressions), args.threshold, ', '.join(regressions)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from unittest import mock
+
+import pytest
+
+from about_time import FEATURES
+
+
+@pytest.fixture
+def S():
+    """One second in ns, the unit of the clock of the handles."""
+    return 1000000000
+
+
+@pytest.fixture
+def mock_timer():
+    """Mock the clock of the handles, in ns."""
+    with mock.patch('time.perf_counter_ns') as mt:
+        yield mt
+
+
+@pytest.fixture
+def mock_perf_counter():
+    """Mock the clock of the sampling, in seconds."""
+    with mock.patch('time.perf_counter') as mt:
+        yield mt
+
+
+
+@pytest.fixture
+def features():
+    yield FEATURES
+    FEATURES.feature_space = FEATURES.feature_iec = False  # which also resets feature_1024.
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))  # they are not installed.
+
+from benchmarks.suite import compare  # noqa: E402
+
+
+def test_compare_regressions(capsys):
+    results = {'same': 1e-6, 'faster': 1e-6, 'slower': 1.2e-6, 'regressed': 1.3e-6}
+    baseline = {'same': 1e-6, 'faster': 2e-6, 'slower': 1e-6, 'regressed': 1e-6}
+    assert compare(results, baseline, .25) == ['regressed']
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 4 and out[3].endswith(' <-- REGRESSION')
+    assert '+0.0%' in out[0] and '-50.0%' in out[1] and '+20.0%' in out[2]
+
+
+def test_compare_threshold():
+    results, baseline = {'a': 1.3e-6}, {'a': 1e-6}
+    assert compare(results, baseline, .2) == ['a']
+    assert compare(results, baseline, .5) == []
+
+
+def test_compare_new_and_zero_baselines(capsys):
+    results = {'new': 1e-6, 'zero': 1e-6}
+    assert compare(results, {'zero': 0.}, .2) == []
+    new, zero = capsys.readouterr().out.splitlines()
+    assert new.endswith('(new)') and zero.endswith('(no baseline)')
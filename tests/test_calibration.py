@@ -0,0 +1,56 @@
+from unittest import mock
+
+import pytest
+
+from about_time import about_time, calibrate, overhead_ns
+from about_time.calibration import _OVERHEADS
+
+
+@pytest.fixture(autouse=True)
+def fresh_overheads():
+    with mock.patch.dict(_OVERHEADS, clear=True):
+        yield
+
+
+def test_calibrate():
+    overhead = calibrate(runs=100)
+    assert isinstance(overhead, int) and 0 < overhead < 1000000
+    assert overhead_ns() == overhead
+
+
+def test_calibrate_median():
+    with mock.patch('time.perf_counter_ns') as mt:
+        mt.side_effect = [0, 5, 0, 100, 0, 3, 0, 4, 0, 6]
+        assert calibrate(runs=5) == 5
+
+
+def test_overhead_ns_calibrates_once():
+    with mock.patch('about_time.calibration.calibrate', wraps=calibrate) as mc:
+        overhead = overhead_ns('thread')
+        assert overhead_ns('thread') == overhead
+    assert mc.call_count == 1 and mc.call_args == mock.call('thread')
+
+
+@pytest.mark.parametrize('clock', ['perf', 'monotonic', 'process', 'thread'])
+def test_calibrate_clocks(clock):
+    assert calibrate(clock, runs=10) >= 0
+    assert clock in _OVERHEADS
+
+
+def test_compensated_duration(S):
+    _OVERHEADS['perf'] = 300
+    with mock.patch('time.perf_counter_ns') as mt:
+        mt.side_effect = S, S + 1000, S, S + 100
+        with about_time(compensate=True) as t:
+            pass
+        assert (t.duration_ns, t.overhead_ns) == (700, 300)
+        with about_time(compensate=True) as t:
+            pass
+        assert t.duration_ns == 0  # never negative.
+
+
+def test_not_compensated():
+    with about_time(clock='perf') as t:
+        pass
+    assert t.overhead_ns == 0
+    assert 'perf' not in _OVERHEADS
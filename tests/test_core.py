@@ -1,4 +1,8 @@
+import asyncio
+import math
 import random
+import threading
+from array import array
 from datetime import datetime
 from decimal import Decimal
 from itertools import chain, repeat, tee
@@ -6,49 +10,43 @@ from unittest import mock
 
 import pytest
 
-from about_time import about_time
-from about_time.core import Handle, HandleStats
+from about_time import FEATURES, about_time, nbytes
+from about_time.core import CLOCKS, Handle, HandleStats
 
 
 @pytest.fixture
 def rand_offset():
-    return random.random() * 1000
-
-
-@pytest.fixture
-def mock_timer():
-    with mock.patch('time.perf_counter') as mt:
-        yield mt
+    return random.randrange(10 ** 12)
 
 
 def test_duration_context_manager_mode(rand_offset, mock_timer):
-    start, end = 1.4 + rand_offset, 2.65 + rand_offset
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
     mock_timer.side_effect = start, end
 
     with about_time() as at:
         pass
 
-    assert at.duration == pytest.approx(end - start)
+    assert at.duration == pytest.approx((end - start) / 1e9)
 
 
 def test_duration_callable_mode(rand_offset, mock_timer):
-    start, end = 1.4 + rand_offset, 2.65 + rand_offset
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
     mock_timer.side_effect = start, end
 
     at = about_time(lambda: 1)
 
-    assert at.duration == pytest.approx(end - start)
+    assert at.duration == pytest.approx((end - start) / 1e9)
 
 
 def test_duration_counter_throughput_mode(rand_offset, mock_timer):
-    start, end = 1.4 + rand_offset, 2.65 + rand_offset
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
     mock_timer.side_effect = start, end
 
     at = about_time(range(2))
     for _ in at:
         pass
 
-    assert at.duration == pytest.approx(end - start)
+    assert at.duration == pytest.approx((end - start) / 1e9)
 
 
 @pytest.mark.parametrize('call, args, kwargs, expected', [
@@ -74,7 +72,7 @@ def test_callable_mode_result(call, args, kwargs, expected):
     (x ** 2 for x in range(8)),
 ])
 def test_counter_throughput_mode(it, rand_offset, mock_timer):
-    start, end = 1.4 + rand_offset, 2.65 + rand_offset
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
     mock_timer.side_effect = chain((start,), repeat(end))
     it_see, it_copy = tee(it)
 
@@ -90,6 +88,111 @@ def test_counter_throughput_mode(it, rand_offset, mock_timer):
     assert at.throughput == pytest.approx(i / 1.25)
 
 
+@pytest.mark.parametrize('it, expected', [
+    ([], 0),
+    ([[1, 2, 3]], 3),
+    ([[1, 2], [], [3]], 3),
+    (['abc', 'de'], 5),
+    ((bytes(n) for n in range(5)), 10),
+])
+def test_counter_throughput_mode_batched(it, expected, rand_offset, mock_timer):
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
+    mock_timer.side_effect = chain((start,), repeat(end))
+    it_see, it_copy = tee(it)
+
+    at = about_time(it_see, batched=True)
+    assert at.count == 0
+
+    total = 0
+    for batch in at:
+        assert batch == next(it_copy)
+        total += len(batch)
+        assert at.count == total  # count works in real time with batches too.
+
+    assert at.count == expected
+    assert at.throughput == pytest.approx(expected / 1.25)
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'abc', bytearray(2), memoryview(b'12345')[1:]], 9),
+    ([array('d', [1., 2.]), memoryview(array('i', [1, 2, 3]))], 16 + 12),
+    ([memoryview(bytes(12)).cast('i')], 12),
+])
+def test_nbytes(chunks, expected):
+    assert sum(nbytes(c) for c in chunks) == expected
+
+
+def test_counter_throughput_mode_weight(mock_timer, S):
+    mock_timer.side_effect = chain((0,), repeat(2 * S))
+    chunks = [bytes(1024), bytes(2048), bytes(1024)]
+
+    at = about_time(chunks, weight=nbytes)
+    assert at.total is None  # the length of the chunks does not count the bytes.
+    assert [c for c in at] == chunks  # the very same objects, not copies.
+    assert at.count == 4096
+    assert at.throughput == 2048.
+
+
+@pytest.mark.parametrize('weight, expected', [
+    (len, 6), (lambda _: 2, 6), (lambda x: x[0], 7),
+])
+def test_counter_throughput_mode_weight_function(weight, expected):
+    at = about_time([[1], [2, 3], [4, 5, 6]], weight=weight)
+    list(at)
+    assert at.count == expected
+
+
+def test_bytes_human_ignore_features(mock_timer, S):
+    mock_timer.side_effect = chain((0,), repeat(S))
+    at = about_time([bytes(1536 * 1024)], weight=nbytes)
+    list(at)
+    saved = FEATURES.feature_1024, FEATURES.feature_iec
+    try:
+        for k, iec in (False, False), (True, False), (True, True):
+            FEATURES.feature_1024, FEATURES.feature_iec = k, iec
+            assert at.count_bytes_human == '1.5MiB'
+            assert at.throughput_bytes_human == '1.5MiB/s'
+            assert at.throughput_recent_bytes_human == '1.5MiB/s'
+    finally:
+        FEATURES.feature_1024, FEATURES.feature_iec = saved
+
+
+def test_counter_throughput_mode_count_restarts():
+    at = about_time([1, 2, 3])
+    assert list(at) == [1, 2, 3]
+    assert at.count == 3
+    assert list(at) == []  # the source iterator is already exhausted.
+    assert at.count == 0
+
+
+def test_counter_throughput_mode_partial_consumption():
+    at = about_time(range(10))
+    it = iter(at)
+    next(it), next(it), next(it)
+    assert at.count == 3
+
+
+@pytest.mark.parametrize('batched', [False, True])
+def test_counter_throughput_mode_histogram(batched):
+    at = about_time([[1], [2, 3], [4, 5, 6]], histogram=True, batched=batched)
+    assert at.histogram.count == 0
+
+    for i, _ in enumerate(at, 1):
+        assert at.histogram.count == i  # the histogram works in real time.
+
+    assert at.count == (6 if batched else 3)
+    assert at.histogram.max.value <= at.duration
+
+
+def test_counter_throughput_mode_without_histogram():
+    assert about_time(range(2)).histogram is None
+
+
+def test_counter_throughput_mode_unknown_option_must_complain():
+    with pytest.raises(TypeError):
+        about_time(range(2), unknown=True)
+
+
 @pytest.mark.parametrize('field', [
     'result',
     'count',
@@ -144,24 +247,300 @@ def test_wrong_params_must_complain(value):
         about_time(value)
 
 
-def test_handle_duration_human():
-    h = Handle([1, 2])
+def test_duration_ns_keeps_resolution(mock_timer):
+    mock_timer.side_effect = 10 ** 18 + 1, 10 ** 18 + 8  # more than 31 years of uptime.
+    with about_time() as at:
+        pass
+    assert at.duration_ns == 7
+    assert at.duration == 7e-9
+
+
+@pytest.mark.parametrize('clock', ['perf', 'monotonic', 'process', 'thread'])
+def test_clock(clock, S):
+    with mock.patch('time.' + CLOCKS[clock]) as mt:
+        mt.side_effect = 3 * S, 5 * S
+        with about_time(clock=clock) as at:
+            pass
+    assert at.duration_ns == 2 * S
+    assert at.cpu_time is None and at.cpu_time_human is None and at.cpu_ratio is None
+
+
+@pytest.mark.parametrize('cpu, clock', [(True, 'process_time_ns'), ('thread', 'thread_time_ns')])
+def test_cpu_time(cpu, clock, mock_timer, S):
+    mock_timer.side_effect = 10 * S, 14 * S
+    with mock.patch('time.' + clock) as mt:
+        mt.side_effect = 2 * S, 3 * S
+        with about_time(cpu=cpu) as at:
+            pass
+    assert (at.duration, at.cpu_time, at.cpu_ratio) == (4., 1., .25)
+    assert at.cpu_time_ns == S
+    assert at.cpu_time_human == '1s'
+
+
+def test_cpu_time_real():
+    with about_time(cpu=True) as at:
+        sum(range(200000))
+    assert 0. < at.cpu_time and 0. < at.cpu_ratio
+    assert at.duration_ns > 0
+    assert at.result is None  # no callable.
+    assert about_time(cpu=True)(sum, range(5)).result == 10
+
+
+def test_cpu_time_running(mock_timer, S):
+    mock_timer.side_effect = S, 3 * S, 4 * S
+    with mock.patch('time.process_time_ns') as mt:
+        mt.side_effect = S, 2 * S, 2 * S
+        with about_time(cpu=True) as at:
+            assert at.cpu_ratio == .5
+
+
+@pytest.mark.parametrize('kwargs, error', [
+    (dict(clock='unknown'), ValueError),
+    (dict(cpu='unknown'), ValueError),
+    (dict(unknown=True), TypeError),
+])
+def test_clock_invalid(kwargs, error):
+    with pytest.raises(error):
+        about_time(**kwargs)
+
+
+def test_handle_duration_human(S):
+    h = Handle([S, 2 * S])
     assert h.duration_human.value == 1
 
 
-def test_handle_count_human():
+def test_handle_count_human(S):
     def it_closure():
         pass
 
     it_closure.count = 1
-    h = HandleStats([1, 2], it_closure)
+    h = HandleStats([S, 2 * S], it_closure)
     assert h.count_human.value == 1
 
 
-def test_handle_throughput_human():
+def test_handle_throughput_human(S):
     def it_closure():
         pass
 
     it_closure.count = 1
-    h = HandleStats([1, 2], it_closure)
+    h = HandleStats([S, 2 * S], it_closure)
     assert h.throughput_human.value == 1
+
+
+def test_throughput_recent(mock_timer, S):
+    at = about_time(iter(range(100)), window=1)
+    mock_timer.side_effect = 0, 10 * S, 11 * S, 100 * S, 101 * S
+    it = iter(at)
+    for _ in range(50):
+        next(it)
+    assert at.throughput_recent == pytest.approx(5.)  # the first read is the lifetime average.
+    for _ in range(50):
+        next(it)
+    assert at.throughput_recent == pytest.approx(5. + (50. - 5.) * (1. - math.exp(-1.)))
+    assert at.throughput_recent_human.value < 1e-30  # stalled for a long time.
+    list(it)
+    assert at.throughput == pytest.approx(100. / 101.)  # the lifetime average barely moves.
+    assert at.throughput_recent_human_as('x').value < 1e-30
+
+
+@pytest.mark.parametrize('reads, expected', [
+    (1, 3010. / 13.),  # a single late read only knows the whole history.
+    (30, 1000.),  # periodic reads follow the current speed.
+])
+def test_throughput_recent_needs_periodic_reads(reads, expected, mock_timer, S):
+    # a slow warm-up of 10 items in 10s, then 1000 items per second.
+    clock = [0]
+    mock_timer.side_effect = lambda: clock[0]
+    at = about_time(iter(range(20000)), window=.5)
+    it = iter(at)
+    for _ in range(10):
+        next(it)
+        clock[0] += S
+    for i in range(1, 31):
+        for _ in range(100):
+            next(it)
+            clock[0] += S // 1000
+        if i > 30 - reads:
+            rate = at.throughput_recent
+    assert rate == pytest.approx(expected, rel=.01)
+
+
+def test_throughput_recent_restart(mock_timer, S):
+    at = about_time([1, 2], window=1)
+    mock_timer.side_effect = 10 * S, 12 * S, 20 * S, 21 * S
+    list(at)
+    assert at.throughput_recent == pytest.approx(1.)
+    list(at)  # the source is exhausted, and the estimator starts over.
+    assert at.throughput_recent == 0.
+
+
+def test_throughput_recent_threads():
+    at = about_time(range(100000))
+    reads, done = [], threading.Event()
+
+    def monitor():
+        while not done.is_set():
+            reads.append(at.throughput_recent)
+
+    threads = [threading.Thread(target=monitor) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for _ in at:
+        pass
+    done.set()
+    for t in threads:
+        t.join()
+    assert reads and all(r >= 0. for r in reads)
+
+
+def test_remaining_percent_eta(mock_timer, S):
+    at = about_time(range(100), window=1)
+    assert (at.total, at.remaining, at.percent) == (100, 100, 0.)
+    mock_timer.side_effect = 0, 10 * S, 11 * S
+    it = iter(at)
+    for _ in range(50):
+        next(it)
+    assert (at.remaining, at.percent) == (50, 50.)
+    assert at.eta.value == pytest.approx(10.)  # the recent rate starts at the average, 5/s.
+    for _ in range(40):
+        next(it)
+    rate = 5. + (40. - 5.) * (1. - math.exp(-1.))
+    assert at.eta.value == pytest.approx(10. / rate)
+
+
+def test_remaining_percent_eta_done():
+    at = about_time([1, 2])
+    list(at)
+    assert (at.remaining, at.percent, at.eta.value) == (0, 100., 0.)
+
+
+@pytest.mark.parametrize('it, kwargs, expected', [
+    (iter(range(3)), {}, None),
+    ((x for x in range(3)), {}, None),
+    (iter(range(3)), dict(total=30), 30),
+    ([[1, 2], [3]], dict(batched=True), None),
+    ([[1, 2], [3]], dict(batched=True, total=3), 3),
+    ([], {}, 0),
+])
+def test_total(it, kwargs, expected):
+    at = about_time(it, **kwargs)
+    assert at.total == expected
+    list(at)
+    if expected is None:
+        assert (at.remaining, at.percent, at.eta) == (None, None, None)
+    else:
+        assert at.percent == pytest.approx(100. * at.count / expected if expected else 100.)
+
+
+class FakeLength(object):
+    def __iter__(self):
+        return iter(range(3))
+
+    def __len__(self):
+        raise TypeError('no length')
+
+
+@pytest.mark.parametrize('source', [range(10 ** 20), FakeLength()])
+def test_total_unknown_length(source):
+    at = about_time(source)
+    assert at.total is None
+    assert next(iter(at)) == 0
+
+
+def test_eta_unknown_rate(mock_timer, S):
+    mock_timer.return_value = S
+    at = about_time(range(3))
+    next(iter(at))
+    assert at.eta is None  # no time has passed.
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_async_context_manager_mode(rand_offset, mock_timer):
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
+    mock_timer.side_effect = start, end
+
+    async def main():
+        async with about_time() as at:
+            pass
+        return at
+
+    assert run(main()).duration == pytest.approx((end - start) / 1e9)
+
+
+def test_async_callable_mode(rand_offset, mock_timer):
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
+    mock_timer.side_effect = start, end
+
+    async def coro_func(x, y):
+        await asyncio.sleep(0)
+        return x + y
+
+    async def main():
+        return await about_time(coro_func, 1, y=41)
+
+    at = run(main())
+    assert at.result == 42
+    assert at.duration == pytest.approx((end - start) / 1e9)
+
+
+@pytest.mark.parametrize('n', [0, 1, 5])
+def test_async_counter_throughput_mode(n, rand_offset, mock_timer):
+    start, end = 1400000000 + rand_offset, 2650000000 + rand_offset
+    mock_timer.side_effect = chain((start,), repeat(end))
+
+    async def agen():
+        for i in range(n):
+            await asyncio.sleep(0)
+            yield i
+
+    async def main():
+        at = about_time(agen())
+        assert at.count == 0
+        i = 0
+        async for i, elem in aenumerate(at):
+            assert elem == i - 1
+            assert at.count == i  # count works in real time.
+        return at, i
+
+    at, i = run(main())
+    assert at.count == n
+    assert at.throughput == pytest.approx(n / 1.25)
+
+
+async def aenumerate(ait):
+    i = 0
+    async for elem in ait:
+        i += 1
+        yield i, elem
+
+
+def test_async_counter_throughput_mode_batched_histogram():
+    async def agen():
+        for chunk in ([1, 2], [3], [4, 5, 6]):
+            yield chunk
+
+    async def main():
+        at = about_time(agen(), batched=True, histogram=True)
+        return at, [x async for x in at]
+
+    at, chunks = run(main())
+    assert chunks == [[1, 2], [3], [4, 5, 6]]
+    assert at.count == 6
+    assert at.histogram.count == 3
+
+
+@pytest.mark.parametrize('handle', [
+    lambda: about_time(),
+    lambda: about_time(lambda: 1),
+    lambda: about_time(range(2)),
+    lambda: about_time(range(2), batched=True, histogram=True),
+    lambda: about_time(clock='monotonic', cpu=True),
+])
+def test_handles_are_compact(handle):
+    at = handle()
+    assert not hasattr(at, '__dict__')
+    with pytest.raises(AttributeError):
+        at.whatever = 1
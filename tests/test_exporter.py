@@ -0,0 +1,220 @@
+import socket
+import time
+from unittest import mock
+
+import pytest
+
+from about_time import Exporter, PrometheusFile, StatsD, about_time, timer
+from about_time.exporter import Metric
+
+
+@pytest.fixture
+def udp():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.settimeout(5.)
+    yield sock
+    sock.close()
+
+
+def receive(sock, n):
+    return [sock.recv(65535).decode() for _ in range(n)]
+
+
+class FakeSink(object):
+    def __init__(self):
+        self.sent = []
+
+    def send(self, metrics, timer_metrics, batch):
+        self.sent.append((dict(metrics), timer_metrics, batch))
+
+
+def test_exporter_aggregates():
+    sink = FakeSink()
+    exporter = Exporter(sink, timers=False)
+    exporter.record('a', 1.5)
+    exporter.record('a', .5, 10)
+    t = about_time(range(3))
+    list(t)
+    exporter.add('b', t)
+    exporter.flush()
+    exporter.record('a', 1.)
+    exporter.flush()
+
+    m = exporter.metrics()
+    assert m['a'] == Metric(3, 12, 3.)
+    assert (m['b'].calls, m['b'].count) == (1, 3)
+    assert [len(batch) for _, _, batch in sink.sent] == [3, 1]
+    assert sink.sent[1][1] == {}
+
+
+def test_exporter_timers():
+    timer('test.exporter').record(2.)
+    sink = FakeSink()
+    Exporter(sink).flush()
+    assert sink.sent[0][1]['test.exporter'].seconds == 2.
+
+
+def test_exporter_drops_oldest():
+    sink = FakeSink()
+    exporter = Exporter(sink, timers=False, max_pending=2)
+    for i in range(5):
+        exporter.record('a', float(i))
+    exporter.flush()
+    assert sink.sent[0][2] == [('a', 3., 1), ('a', 4., 1)]
+
+
+def test_exporter_background_thread():
+    sink = FakeSink()
+    with Exporter(sink, interval=.01, timers=False) as exporter:
+        exporter.record('a', 1.)
+        deadline = time.monotonic() + 5.
+        while not sink.sent and time.monotonic() < deadline:
+            time.sleep(.01)
+        assert sink.sent  # flushed by the thread.
+        exporter.record('a', 2.)
+    # the thread or the last flush on exit sent the second one.
+    assert [r for _, _, batch in sink.sent for r in batch] == [('a', 1., 1), ('a', 2., 1)]
+    assert exporter.metrics()['a'].calls == 2
+
+
+def test_exporter_stop_closes_sink():
+    class Closable(FakeSink):
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    sink = Closable()
+    with Exporter(sink, timers=False) as exporter:
+        exporter.record('a', 1.)
+    assert sink.closed and sink.sent[-1][2] == [('a', 1., 1)]
+    Exporter(FakeSink()).stop()  # sinks without close are fine.
+
+
+@pytest.mark.parametrize('error', [OSError('unreachable'), ValueError('bad metric')])
+def test_exporter_keeps_errors(error):
+    class Broken(object):
+        def send(self, *_):
+            raise error
+
+    exporter = Exporter(Broken())
+    exporter.flush()
+    assert exporter.last_error is error
+
+
+def test_exporter_thread_survives_errors():
+    calls = []
+
+    class Flaky(object):
+        def send(self, metrics, *_):
+            calls.append(dict(metrics))
+            if len(calls) == 1:
+                raise ValueError('once')
+
+    with Exporter(Flaky(), interval=.01, timers=False) as exporter:
+        exporter.record('a', 1.)
+        deadline = time.monotonic() + 5.
+        while len(calls) < 3 and time.monotonic() < deadline:
+            time.sleep(.01)
+    assert len(calls) >= 3 and isinstance(exporter.last_error, ValueError)
+
+
+def test_prometheus_file(tmp_path):
+    path = tmp_path / 'about_time.prom'
+    exporter = Exporter(PrometheusFile(str(path)), timers=False)
+    exporter.record('db.query', 1.5, 3)
+    exporter.record('say "hi"', .25)
+    exporter.flush()
+    assert path.read_text() == '\n'.join([
+        '# HELP about_time_seconds The durations of the timings.',
+        '# TYPE about_time_seconds summary',
+        'about_time_seconds_sum{name="db.query"} 1.5',
+        'about_time_seconds_count{name="db.query"} 1',
+        'about_time_seconds_sum{name="say \\"hi\\""} 0.25',
+        'about_time_seconds_count{name="say \\"hi\\""} 1',
+        '# HELP about_time_items_total The items processed in the timings.',
+        '# TYPE about_time_items_total counter',
+        'about_time_items_total{name="db.query"} 3',
+        'about_time_items_total{name="say \\"hi\\""} 1',
+    ]) + '\n'
+    assert [p.name for p in tmp_path.iterdir()] == ['about_time.prom']
+
+
+def test_prometheus_file_merges_timers(tmp_path):
+    sink = PrometheusFile(str(tmp_path / 'x.prom'), prefix='app')
+    sink.send({'a': Metric(1, 1, 1.)}, {'a': Metric(2, 2, 3.), 'b': Metric(1, 1, 1.)}, [])
+    text = (tmp_path / 'x.prom').read_text()
+    assert 'app_seconds_sum{name="a"} 4.0' in text
+    assert 'app_seconds_count{name="b"} 1' in text
+
+
+def test_statsd(udp):
+    sink = StatsD(*udp.getsockname())
+    exporter = Exporter(sink, timers=False)
+    exporter.record('db.query', .0015)
+    exporter.record('load', 2., 100)
+    exporter.flush()
+    assert receive(udp, 1) == [
+        'about_time.db.query:1.5|ms\nabout_time.load:2000|ms\nabout_time.load.items:100|c']
+    sink.close()
+
+
+def test_statsd_packets(udp):
+    sink = StatsD(*udp.getsockname(), prefix='p', max_packet=30)
+    exporter = Exporter(sink, timers=False)
+    for _ in range(4):
+        exporter.record('abc', .001)
+    exporter.flush()
+    assert receive(udp, 2) == ['p.abc:1|ms\np.abc:1|ms', 'p.abc:1|ms\np.abc:1|ms']
+
+
+def test_statsd_timers(udp):
+    sink = StatsD(*udp.getsockname())
+    sink.send({}, {'t': Metric(2, 2, .004)}, [])
+    sink.send({}, {'t': Metric(2, 2, .004)}, [])  # nothing new.
+    sink.send({}, {'t': Metric(6, 6, .008)}, [])
+    assert receive(udp, 2) == ['about_time.t:2|ms|@0.5', 'about_time.t:1|ms|@0.25']
+
+
+def test_statsd_timers_resent_after_failure(udp):
+    sink = StatsD(*udp.getsockname())
+    with mock.patch('socket.socket.sendto', side_effect=OSError('down')):
+        with pytest.raises(OSError):
+            sink.send({}, {'t': Metric(2, 2, .004)}, [])
+    sink.send({}, {'t': Metric(4, 4, .012)}, [])
+    assert receive(udp, 1) == ['about_time.t:3|ms|@0.25']  # includes the failed delta.
+    sink.close()
+
+
+def test_statsd_timers_sent_are_not_resent(udp):
+    real, calls = socket.socket.sendto, []
+
+    def flaky(sock, data, address):
+        calls.append(data)
+        if len(calls) == 2:
+            raise OSError('down')
+        return real(sock, data, address)
+
+    sink = StatsD(*udp.getsockname(), max_packet=25)  # one timer per packet.
+    timers = {'a': Metric(1, 1, .001), 'b': Metric(1, 1, .002)}
+    with mock.patch('socket.socket.sendto', flaky):
+        with pytest.raises(OSError):
+            sink.send({}, timers, [])
+    sink.send({}, timers, [])
+    assert receive(udp, 2) == ['about_time.a:1|ms|@1', 'about_time.b:2|ms|@1']
+    sink.close()
+
+
+def test_statsd_ipv6():
+    try:
+        sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+        sock.bind(('::1', 0))
+    except OSError:  # pragma: no cover
+        pytest.skip('IPv6 is not available')
+    with sock:
+        sock.settimeout(5.)
+        sink = StatsD('::1', sock.getsockname()[1])
+        sink.send({}, {}, [('a', .001, 1)])
+        assert receive(sock, 1) == ['about_time.a:1|ms']
+        sink.close()
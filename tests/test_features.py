@@ -0,0 +1,40 @@
+import pytest
+
+from about_time import HumanCount, HumanDuration, HumanThroughput
+
+
+def test_compiled_formatters_are_cached(features):
+    assert HumanCount.formatter() is HumanCount.formatter()
+    assert HumanDuration.formatter() is HumanDuration.formatter()
+    assert HumanThroughput.formatter() is HumanThroughput.formatter()
+
+
+@pytest.mark.parametrize('name, value', [
+    ('feature_space', True),
+    ('feature_1024', True),
+    ('feature_iec', True),
+])
+def test_compiled_formatters_are_invalidated(name, value, features):
+    fmt = HumanCount.formatter()
+    setattr(features, name, value)
+    assert HumanCount.formatter() is not fmt
+
+
+def test_features_are_applied(features):
+    fmt = HumanCount.formatter()
+    assert HumanCount(1230, 'B') == '1.2kB'
+    assert HumanDuration(.0156) == '15.6ms'
+    assert HumanThroughput(2500., 'B') == '2.5kB/s'
+
+    features.feature_space = True
+    assert HumanCount(1230, 'B') == '1.2 kB'
+    assert HumanDuration(.0156) == '15.6 ms'
+    assert HumanThroughput(2500., 'B') == '2.5 kB/s'
+
+    features.feature_1024 = True
+    assert HumanCount(1230, 'B') == '1.2 KB'
+    features.feature_iec = True
+    assert HumanCount(1230, 'B') == '1.2 KiB'
+    assert HumanThroughput(2500., 'B') == '2.4 KiB/s'
+
+    assert fmt(1230, 'B') == '1.2kB'  # the formatter is bound to the features of its time.
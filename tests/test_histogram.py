@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from about_time import Histogram
+from about_time.histogram import BUCKETS, bucket_index, bucket_range
+
+
+@pytest.mark.parametrize('ns', [
+    0, 1, 127, 128, 129, 255, 256, 1000, 123456789, 2 ** 40 + 12345, 2 ** 64 - 1,
+])
+def test_bucket_contains_value(ns):
+    low, high = bucket_range(bucket_index(ns))
+    assert low <= ns <= high
+
+
+def test_buckets_are_contiguous():
+    prev = -1
+    for index in range(BUCKETS):
+        low, high = bucket_range(index)
+        assert low == prev + 1
+        prev = high
+    assert prev == 2 ** 64 - 1
+
+
+def test_bucket_relative_error():
+    for ns in (random.getrandbits(64) for _ in range(1000)):
+        low, high = bucket_range(bucket_index(ns))
+        assert ns < 128 or (high - low + 1) / low <= 1 / 64
+
+
+def test_empty_histogram():
+    h = Histogram()
+    assert h.count == 0
+    assert h.p50.value == 0
+    assert h.max.value == 0
+
+
+@pytest.mark.parametrize('p, expected', [
+    (0., 1),
+    (50., 50),
+    (90., 90),
+    (99., 99),
+    (100., 100),
+])
+def test_percentiles_exact_buckets(p, expected):
+    h = Histogram()
+    for ns in range(1, 101):
+        h.record(ns)
+    assert h.count == 100
+    assert h.percentile_ns(p) == expected
+
+
+def test_percentiles_relative_error():
+    values = sorted(random.randrange(1000, 10 ** 9) for _ in range(1001))
+    h = Histogram()
+    for ns in values:
+        h.record(ns)
+    for p in (50., 90., 99.):
+        expected = values[-(-len(values) * int(p) // 100) - 1]  # the nearest rank.
+        assert h.percentile_ns(p) == pytest.approx(expected, rel=1 / 64)
+    assert h.percentile_ns(100.) == h.max.value * 1e9 == values[-1]
+
+
+def test_human_percentiles():
+    h = Histogram()
+    h.record(1_500_000)
+    assert h.p50 == '1.5ms'
+    assert h.p90 == '1.5ms'
+    assert h.p99 == '1.5ms'
+    assert h.max == '1.5ms'
+
+
+def test_merge():
+    a, b = Histogram(), Histogram()
+    for ns in range(1, 51):
+        a.record(ns)
+    for ns in range(51, 101):
+        b.record(ns)
+
+    c = a + b
+    assert (a.count, b.count, c.count) == (50, 50, 100)
+    assert c.percentile_ns(50.) == 50
+    assert c.max.value * 1e9 == 100
+
+    d = Histogram.merged([a, b, c])
+    assert d.count == 200
+    assert a.merge(b) is a
+    assert a.count == 100
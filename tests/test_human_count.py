@@ -1,6 +1,12 @@
+import random
+import struct
+
 import pytest
 
 from about_time import HumanCount
+from about_time.features import IEC
+from about_time.human_count import DECIMALS, IEC_1024_SPEC, SI_1000_SPEC, SI_1024_SPEC, \
+    fn_human_count, format_many, parse_count, scale_bounds
 
 
 @pytest.mark.parametrize('count, expected', [
@@ -117,3 +123,161 @@ def test_count_human(count, expected):
 def test_count_human_prec(count, prec, expected):
     assert HumanCount(count, 'X').as_human(prec) == expected
     assert HumanCount(count, '!').unit('X').as_human(prec) == expected
+
+
+def _count_samples():
+    values = [0, 1, 999, 1000, 1023, 1024, 2 ** 53, 2 ** 60, 999.95, 999.9499999999999,
+              999999.5, 1e30, 1.23e27, float('inf')]
+    rnd = random.Random(42)
+    values += [10 ** rnd.uniform(-3, 28) for _ in range(3000)]
+    values += [rnd.randrange(10 ** 7) for _ in range(1000)]
+    for k in range(9):  # around the rounding boundaries of each scale.
+        for base in (1000, 1024):
+            edge = base ** (k + 1) - base ** k * .05
+            values += [edge * (1 + d * 1e-15) for d in range(-8, 9)]
+    return values
+
+
+@pytest.mark.parametrize('space, iec, d1024', [
+    (False, False, False),
+    (True, False, True),
+    (False, True, True),
+])
+@pytest.mark.parametrize('prec', [None, 0, 1, 2])
+def test_format_many_matches_scalar(space, iec, d1024, prec, features):
+    features.feature_space, features.feature_1024, features.feature_iec = space, d1024, iec
+    values = _count_samples()
+    expected = [HumanCount(v, 'X').as_human(prec) for v in values]
+    assert format_many(values, 'X', prec) == expected
+    assert format_many(iter(values), 'X', prec) == expected  # not vectorizable.
+
+
+def test_format_many_numpy(features):
+    np = pytest.importorskip('numpy')
+    values = np.array([[1.23, 1230.], [1825100., 1.23e27]])
+    assert format_many(values, 'B') == ['1.2B', '1.2kB', '1.8MB', '1.23+B']
+    assert format_many(np.arange(998, 1002), 'B') == ['998B', '999B', '1kB', '1kB']
+    assert format_many(np.array([2 ** 62], np.int64), 'B') == [HumanCount(2 ** 62, 'B')]
+    assert format_many(np.array([], np.int64), 'B') == []
+
+
+@pytest.mark.parametrize('prec', [None, 0, 1, 3, 25, 400])
+def test_format_many_rounding_ties(prec, features):
+    pytest.importorskip('numpy')
+    # the decimal ties, which the builtin `round` decides on the exact value of the float.
+    values = [.05, .15, .25, 2.675, 1.005, 999.95, 1049.95, 1e300, 5e-324, float('inf')]
+    values += [k / 20 for k in range(400)] + [k / 200 for k in range(400)]
+    assert format_many(values, '{}', prec) == [HumanCount(v, '{}').as_human(prec) for v in values]
+
+
+def _reference_human_count(val, unit, prec, space, divisor, spec):
+    """The previous scale-by-scale search, to verify the O(1) one."""
+    for scale, dec in zip(spec, DECIMALS):
+        r = round(val, dec)
+        if r >= divisor:
+            val /= divisor
+            continue
+        break
+    else:
+        r, scale = val, '+'
+
+    if prec is not None:
+        r = round(val, prec)
+    elif r % 1. == 0.:
+        prec = 0
+    elif (r * 10.) % 1. == 0.:
+        prec = 1
+    else:
+        prec = 2
+    return '{:.{}f}{}{}{}'.format(r, prec, space, scale, unit)
+
+
+def _ulps(x, n):
+    b = struct.unpack('<q', struct.pack('<d', x))[0]
+    return [struct.unpack('<d', struct.pack('<q', b + d))[0] for d in range(-n, n + 1)]
+
+
+def _boundary_samples(divisor):
+    values = [0, 1, 0., .05, .949999, float('nan'), float('inf'), 10 ** 30]
+    for bound in scale_bounds(divisor):
+        values += _ulps(bound, 64)
+        near = int(bound)
+        values += list(range(max(0, near - 3), near + 4))
+    for k in range(10):
+        values += list(range(divisor ** k - 2, divisor ** k + 3))
+        values += _ulps(float(divisor ** k), 4)
+        for digits in range(1, 4):  # every rounding boundary of 1 and 2 decimals.
+            for m in range(1, 1000, 7):
+                values += _ulps(divisor ** k * (m + .5 * 10 ** -digits), 2)
+    return values
+
+
+@pytest.mark.parametrize('d1024, iec', [(False, False), (True, False), (True, True)])
+@pytest.mark.parametrize('space', [False, True])
+@pytest.mark.parametrize('prec', [None, 0, 1, 2])
+def test_scale_selection_matches_reference(d1024, iec, space, prec):
+    fmt = fn_human_count(space, d1024, iec)
+    divisor, spec = (1024, IEC_1024_SPEC if iec else SI_1024_SPEC) if d1024 \
+        else (1000, SI_1000_SPEC)
+    for v in _boundary_samples(divisor):
+        assert fmt(v, 'X', prec) == _reference_human_count(
+            v, 'X', prec, ' ' if space else '', divisor, spec), v
+
+
+def test_own_features(features):
+    features.feature_space = True
+    assert HumanCount(1536, 'B', IEC) == '1.5KiB'
+    assert HumanCount(1536, 'B') == '1.5 kB'
+
+
+def test_compact():
+    assert not hasattr(HumanCount(1, "X"), '__dict__')
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('0', 0.), ('7', 7.), ('12B', 12.), ('1.5k', 1500.), ('1.5 kB', 1500.), ('1.5K', 1536.),
+    ('2.5Mi', 2.5 * 1024 ** 2), ('2.5 MiB', 2.5 * 1024 ** 2), ('1.5M', 1.5e6),
+    ('3.2G', 3.2e9), ('1.23Y', 1.23e24), ('1.2+', 1.2e27), ('1e3k', 1e6), (' 12 ', 12.),
+    ('1.230k', 1230.), ('1000T', 1e15),  # custom precisions.
+])
+def test_parse_count(text, expected):
+    assert parse_count(text, d1024=False) == pytest.approx(expected)
+
+
+def test_parse_count_1024(features):
+    assert parse_count('1.5M', d1024=True) == 1.5 * 1024 ** 2
+    assert parse_count('1.5k', d1024=True) == 1500.  # "k" is only in base 1000.
+    assert parse_count('1.2+', d1024=True) == pytest.approx(1.2 * 1024 ** 9)
+    features.feature_1024 = True
+    assert parse_count('1.5M') == 1.5 * 1024 ** 2  # follows the features.
+
+
+def test_parse_count_unit():
+    assert parse_count('1.2krows', 'rows') == 1200.  # lowercase units must be given.
+    assert parse_count('10 Items', d1024=False) == 10.
+    assert parse_count('12Mbit', 'Mbit') == 12.  # the unit is not taken as a scale.
+    assert parse_count('3kMbit', 'Mbit') == 3000.
+    assert parse_count('3 kB', 'B') == 3000.
+
+
+@pytest.mark.parametrize('text, unit', [
+    ('', None), ('k', None), ('abc', None), ('1.5kB', 'x'), ('1.5xB', 'B'), ('-1', None),
+    ('1.5.3k', None), ('10Minutes', None), ('2 Gigs', None), ('1.2krows', None),
+    ('1.5kB/s', None), ('1.5k B', None),
+])
+def test_parse_count_invalid(text, unit):
+    with pytest.raises(ValueError):
+        parse_count(text, unit)
+
+
+@pytest.mark.parametrize('d1024, iec', [(False, False), (True, False), (True, True)])
+@pytest.mark.parametrize('space', [False, True])
+@pytest.mark.parametrize('unit', ['', 'B'])
+def test_parse_count_round_trip(d1024, iec, space, unit):
+    fmt, rnd = fn_human_count(space, d1024, iec), random.Random(42)
+    values = [rnd.random() * 10. ** rnd.randrange(-2, 25) for _ in range(500)]
+    values += [rnd.randrange(10 ** rnd.randrange(1, 20)) for _ in range(200)]
+    for v in values:
+        text = fmt(v, unit)
+        assert fmt(parse_count(text, unit, d1024), unit) == text
+
@@ -1,6 +1,11 @@
+import random
+import struct
+
 import pytest
 
 from about_time import HumanDuration
+from about_time.human_duration import SPEC, duration_bounds, fn_human_duration, format_many, \
+    parse_duration
 
 
 @pytest.mark.parametrize('duration, expected', [
@@ -85,3 +90,119 @@ def test_duration_human(duration, expected):
 ])
 def test_duration_human_prec_2(duration, prec, expected):
     assert HumanDuration(duration).as_human(prec) == expected
+
+
+def _duration_samples():
+    rnd = random.Random(42)
+    values = [0., 1e-9, .000000999996, .000999999, 59.9949, 59.995, 59.999, 3599.95, 3600.,
+              1e7, float('inf')]
+    values += [10 ** rnd.uniform(-11, 6) for _ in range(3000)]
+    for edge in (1e-6, 1e-3, 1., 60.):
+        values += [edge * (1 + d * 1e-15) for d in range(-8, 9)]
+        values += [edge * (1 - .00005) * (1 + d * 1e-15) for d in range(-8, 9)]
+    return values
+
+
+@pytest.mark.parametrize('space', [False, True])
+@pytest.mark.parametrize('prec', [None, 0, 1, 2])
+def test_format_many_matches_scalar(space, prec, features):
+    features.feature_space = space
+    values = _duration_samples()
+    expected = [HumanDuration(v).as_human(prec) for v in values]
+    assert format_many(values, prec) == expected
+    assert format_many(iter(values), prec) == expected  # not vectorizable.
+
+
+def test_format_many_numpy():
+    np = pytest.importorskip('numpy')
+    values = np.array([.00000000185, .0141233333333, 59.999, 3888.395])
+    assert format_many(values) == ['1.9ns', '14.1ms', '1:00', '1:04:48']
+
+
+def _reference_human_duration(val, prec, space):
+    """The previous scale-by-scale search, to verify the O(1) one."""
+    val *= 1e9
+    for size, div_next, scale, dec in SPEC:
+        r = round(val, dec)
+        if r >= size:
+            val /= div_next
+            continue
+
+        if prec is not None:
+            r = round(val, prec)
+        elif r % 1. == 0.:
+            prec = 0
+        elif (r * 10.) % 1. == 0.:
+            prec = 1
+        else:
+            prec = 2
+        return '{:.{}f}{}{}'.format(r, prec, space, scale)
+
+    val = round(val, 1)
+    m = val / 60.
+    if m < 60.:
+        r = val % 60.
+        if prec is not None:
+            pass
+        elif r % 1. == 0.:
+            prec = 0
+
+        if prec == 0:
+            return '{:.0f}:{:02.0f}'.format(m // 1., r)
+        return '{:.0f}:{:04.1f}'.format(m // 1., round(r, 1))
+
+    return '{:.0f}:{:02.0f}:{:02.0f}'.format(m / 60. // 1., m % 60. // 1., val % 60. // 1.)
+
+
+def _ulps(x, n):
+    b = struct.unpack('<q', struct.pack('<d', x))[0]
+    return [struct.unpack('<d', struct.pack('<q', b + d))[0] for d in range(-n, n + 1)]
+
+
+def _boundary_samples():
+    values = [0., 1e-12, float('nan'), float('inf'), 1e12]
+    for bound in duration_bounds():
+        values += _ulps(bound / 1e9, 64)
+    for scale in (1e-9, 1e-6, 1e-3, 1.):
+        for digits in range(1, 4):  # every rounding boundary of 1 and 2 decimals.
+            for m in range(1, 1000, 7):
+                values += _ulps(scale * (m + .5 * 10 ** -digits), 2)
+    for s in range(0, 7200, 13):  # minutes and hours.
+        values += _ulps(s + .05, 2) + _ulps(s + .95, 2) + _ulps(float(s), 2)
+    return values
+
+
+@pytest.mark.parametrize('space', [False, True])
+@pytest.mark.parametrize('prec', [None, 0, 1, 2])
+def test_scale_selection_matches_reference(space, prec):
+    fmt = fn_human_duration(space)
+    for v in _boundary_samples():
+        assert fmt(v, prec) == _reference_human_duration(v, prec, ' ' if space else ''), v
+
+
+def test_compact():
+    assert not hasattr(HumanDuration(1), '__dict__')
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('0ns', 0.), ('123ns', 123e-9), ('350µs', 350e-6), ('350us', 350e-6), ('12.5 ms', .0125),
+    ('45.2s', 45.2), ('1:02.5', 62.5), ('1:00', 60.), ('59:59.9', 3599.9), ('1:01:01', 3661.),
+    ('100:00:00', 360000.),
+])
+def test_parse_duration(text, expected):
+    assert parse_duration(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('text', ['', 's', '12', '12 sec', '1:2', '1:02:3', '1h', '-1s'])
+def test_parse_duration_invalid(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+
+@pytest.mark.parametrize('space', [False, True])
+def test_parse_duration_round_trip(space):
+    fmt, rnd = fn_human_duration(space), random.Random(42)
+    for v in [rnd.random() * 10. ** rnd.randrange(-10, 6) for _ in range(2000)]:
+        text = fmt(v)
+        assert fmt(parse_duration(text)) == text
+
@@ -1,6 +1,10 @@
+import random
+
 import pytest
 
 from about_time import HumanThroughput
+from about_time.features import IEC
+from about_time.human_throughput import fn_human_throughput, format_many, parse_throughput
 
 
 @pytest.mark.parametrize('count, duration, expected', [
@@ -75,3 +79,80 @@ def test_throughput_human(count, duration, expected):
 def test_throughput_human_prec(count, duration, prec, expected):
     assert HumanThroughput(count / duration, 'X').as_human(prec) == expected
     assert HumanThroughput(count / duration, '!').unit('X').as_human(prec) == expected
+
+
+def _throughput_samples():
+    rnd = random.Random(42)
+    values = [0., 1 / 86400, 1 / 3600, 1 / 60, 1., 999.95, 1e30, float('inf')]
+    values += [10 ** rnd.uniform(-7, 12) for _ in range(3000)]
+    for edge in (24., 60. * 24., 60. * 60. * 24.):
+        edge /= 86400.
+        values += [edge * (1 + d * 1e-15) for d in range(-8, 9)]
+        values += [edge * (1 - .0005) * (1 + d * 1e-15) for d in range(-8, 9)]
+    return values
+
+
+@pytest.mark.parametrize('space, iec, d1024', [
+    (False, False, False),
+    (True, False, True),
+    (False, True, True),
+])
+@pytest.mark.parametrize('prec', [None, 0, 1, 2])
+def test_format_many_matches_scalar(space, iec, d1024, prec, features):
+    features.feature_space, features.feature_1024, features.feature_iec = space, d1024, iec
+    values = _throughput_samples()
+    expected = [HumanThroughput(v, 'X').as_human(prec) for v in values]
+    assert format_many(values, 'X', prec) == expected
+    assert format_many(iter(values), 'X', prec) == expected  # not vectorizable.
+
+
+def test_format_many_numpy():
+    np = pytest.importorskip('numpy')
+    values = np.array([10., 2500., 1 / 2., 3 / 1600., 123 / 1165263.])
+    assert format_many(values, 'X') == ['10X/s', '2.5kX/s', '30X/m', '6.8X/h', '9.12X/d']
+
+
+def test_compact():
+    assert not hasattr(HumanThroughput(1, "X"), '__dict__')
+
+
+def test_own_features(features):
+    features.feature_space = True
+    assert HumanThroughput(1536, 'B', IEC) == '1.5KiB/s'
+    assert HumanThroughput(1536, 'B') == '1.5 kB/s'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('12.5k/s', 12500.), ('12.5 kB/s', 12500.), ('2.3MiB/s', 2.3 * 1024 ** 2), ('1.2/s', 1.2),
+    ('1.5/m', .025), ('3.6 B/h', .001), ('24/d', 1. / 3600.),
+])
+def test_parse_throughput(text, expected):
+    assert parse_throughput(text, d1024=False) == pytest.approx(expected)
+
+
+def test_parse_throughput_unit():
+    assert parse_throughput('3.6 B/h', 'B') == pytest.approx(.001)
+    assert parse_throughput('2kB/s', 'B') == 2000.
+    assert parse_throughput('3.6 rows/h', 'rows') == pytest.approx(.001)
+    assert parse_throughput('1.5B/m', d1024=False) == .025
+
+
+@pytest.mark.parametrize('text, unit', [
+    ('', None), ('12', None), ('12/x', None), ('/s', None), ('3 B/h', 'x'), ('3 kB/s', 'x'),
+    ('1.5garbage/m', None), ('1.5.3/m', None), ('10Minutes/s', None), ('2 Gigs/s', None),
+    ('3 rows/h', None),
+])
+def test_parse_throughput_invalid(text, unit):
+    with pytest.raises(ValueError):
+        parse_throughput(text, unit)
+
+
+@pytest.mark.parametrize('d1024, iec', [(False, False), (True, False), (True, True)])
+@pytest.mark.parametrize('space', [False, True])
+@pytest.mark.parametrize('unit', ['', 'B'])
+def test_parse_throughput_round_trip(d1024, iec, space, unit):
+    fmt, rnd = fn_human_throughput(space, d1024, iec), random.Random(42)
+    for v in [rnd.random() * 10. ** rnd.randrange(-8, 25) for _ in range(500)]:
+        text = fmt(v, unit)
+        assert fmt(parse_throughput(text, unit, d1024), unit) == text
+
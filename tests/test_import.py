@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+import pytest
+
+import about_time
+
+HEAVY = ('typing', 'contextlib', 'functools', 'threading', 'importlib.metadata',
+         'multiprocessing', 'struct')
+
+
+def _modules_after(code):
+    out = subprocess.run([sys.executable, '-c', code + '; import sys; print(*sys.modules)'],
+                         check=True, capture_output=True, text=True).stdout
+    return set(out.split())
+
+
+def test_import_is_light():
+    modules = _modules_after('from about_time import about_time')
+    assert not modules & set(HEAVY)
+    assert {'about_time', 'about_time.core'} <= modules
+
+
+def test_about_time_does_not_need_anything_else():
+    modules = _modules_after('from about_time import about_time; '
+                             'list(about_time(range(3))); about_time(len, "x")')
+    assert not modules & set(HEAVY)
+
+
+@pytest.mark.parametrize('name', about_time.__all__)
+def test_lazy_exports(name):
+    assert getattr(about_time, name) is not None or name == '__author__'
+    assert name in dir(about_time)
+
+
+def test_metadata():
+    assert about_time.VERSION == tuple(map(int, about_time.__version__.split('.')))
+    assert isinstance(about_time.__email__, (str, type(None)))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        about_time.unknown  # noqa
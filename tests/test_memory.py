@@ -0,0 +1,107 @@
+import asyncio
+import tracemalloc
+
+import pytest
+
+from about_time import FEATURES, about_time
+from about_time.memory import AllocationSite, MemoryStats
+
+
+@pytest.fixture(autouse=True)
+def features_1024_off():
+    saved = FEATURES.feature_1024, FEATURES.feature_iec
+    FEATURES.feature_iec = False
+    yield
+    FEATURES.feature_iec, FEATURES.feature_1024 = saved[1], saved[0]
+
+
+def allocate():
+    return [bytes(1000) for _ in range(1000)]
+
+
+def test_memory_context_manager():
+    with about_time(memory=True) as t:
+        assert t.memory.peak is None and t.memory.net is None
+        assert str(t.memory) == 'running'
+        x = allocate()
+        y = bytearray(4 * 1024 * 1024)
+        del y
+
+    m = t.memory
+    assert isinstance(m, MemoryStats)
+    assert 1000 * 1000 < m.net_bytes < 1100 * 1000
+    assert 4 * 1024 * 1024 < m.peak_bytes < 6 * 1024 * 1024
+    assert str(m.peak).endswith('MiB')  # IEC, regardless of the global features.
+    assert str(m.net).endswith('KiB')
+    assert str(m).startswith('peak: ') and ', net: +' in str(m)
+    assert m.top == []
+    assert not tracemalloc.is_tracing()
+    del x
+
+
+def test_memory_freed():
+    tracemalloc.start()  # the freed memory must have been traced.
+    try:
+        x = allocate()
+        with about_time(memory=True) as t:
+            x.clear()
+    finally:
+        tracemalloc.stop()
+    assert t.memory.net_bytes < -900 * 1000
+    assert t.memory.net.value == -t.memory.net_bytes
+    assert ', net: -' in str(t.memory)
+
+
+def test_memory_callable():
+    t = about_time(memory=True)(allocate)
+    assert len(t.result) == 1000
+    assert t.memory.net_bytes > 1000 * 1000
+    assert t.duration > 0.
+
+
+def test_memory_async_callable():
+    async def coro():
+        await asyncio.sleep(0)
+        return allocate()
+
+    t = asyncio.run(about_time(memory=True)(coro))
+    assert len(t.result) == 1000
+    assert t.memory.net_bytes > 1000 * 1000
+
+
+def test_memory_top_sites():
+    with about_time(memory=2) as t:
+        x = allocate()
+
+    top = t.memory.top
+    assert 1 <= len(top) <= 2
+    assert isinstance(top[0], AllocationSite)
+    assert __file__ in top[0].where
+    assert top[0].size_bytes > 1000 * 1000 and top[0].count >= 1000
+    assert str(top[0].size).endswith('KiB')
+    assert 'about_time' + '/' not in ''.join(s.where for s in top)
+    del x
+
+
+def test_memory_already_tracing():
+    tracemalloc.start()
+    try:
+        with about_time(memory=True) as t:
+            x = allocate()
+        assert tracemalloc.is_tracing()  # not stopped, since it was not started by us.
+    finally:
+        tracemalloc.stop()
+    assert t.memory.net_bytes > 1000 * 1000
+    del x
+
+
+def test_memory_exception():
+    with pytest.raises(ValueError):
+        about_time(memory=True)(int, 'x')
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_not_traced():
+    with about_time(cpu=True) as t:
+        pass
+    assert t.memory is None and t.result is None
@@ -0,0 +1,134 @@
+import io
+import threading
+
+from about_time import Reporter, about_time
+
+
+def test_sample_deltas(mock_timer, S):
+    mock_timer.return_value = 10 * S
+    reporter = Reporter()
+    t = reporter.watch('items', about_time(range(100)), 'it')
+    it = iter(t)
+    assert reporter.sample() == []  # not started yet.
+
+    for _ in range(30):
+        next(it)
+    mock_timer.return_value = 12 * S
+    s, = reporter.sample()
+    assert (s.name, s.count, s.delta_count, s.duration, s.delta_seconds) == \
+        ('items', 30, 30, 2., 2.)
+    assert (s.throughput, s.throughput_avg, s.percent, s.done) == (15., 15., 30., False)
+
+    for _ in range(50):
+        next(it)
+    mock_timer.return_value = 17 * S
+    s, = reporter.sample()
+    assert (s.count, s.delta_count, s.duration, s.delta_seconds) == (80, 50, 7., 5.)
+    assert (s.throughput, s.throughput_avg, s.percent) == (10., 80. / 7., 80.)
+    assert s.eta is not None
+
+
+def test_sample_str(mock_timer, S):
+    mock_timer.return_value = S
+    reporter = Reporter()
+    t = reporter.watch('rows', about_time(range(2000)), 'rows')
+    it = iter(t)
+    for _ in range(1500):
+        next(it)
+    mock_timer.return_value = 4 * S
+    s, = reporter.sample()
+    assert str(s).startswith('rows: 3s, 1.5krows (+1.5krows) at 500rows/s '
+                             '(avg 500rows/s), 75.0%, eta ')
+
+    list(it)
+    s, = reporter.sample()
+    assert str(s) == 'rows: 3s, 2krows (+500rows) at 0rows/d (avg 666.7rows/s), 100.0%, done'
+
+
+def test_sample_restarted_handle(mock_timer, S):
+    mock_timer.return_value = S
+    file = io.StringIO()
+    reporter = Reporter(file=file)
+    t = reporter.watch('a', about_time(iter([1, 2, 3, 4, 5])))
+    it = iter(t)
+    next(it), next(it), next(it)
+    mock_timer.return_value = 3 * S
+    reporter.report()
+
+    mock_timer.return_value = 10 * S
+    it = iter(t)  # the count restarts.
+    next(it)
+    mock_timer.return_value = 11 * S
+    s, = reporter.sample()
+    assert (s.count, s.delta_count, s.duration, s.delta_seconds) == (1, 1, 1., 1.)
+    reporter.report()
+    assert reporter.last_error is None
+    assert file.getvalue().count('\n') == 2
+
+
+def test_handles_without_count(mock_timer, S):
+    mock_timer.side_effect = [S, 3 * S, 3 * S]
+    reporter = Reporter()
+    with reporter.watch('block', about_time()):
+        s, = reporter.sample()
+    assert (s.count, s.delta_count, s.percent, s.eta) == (None, 0, None, None)
+    assert str(s) == 'block: 2s'
+
+
+def test_watch_unwatch():
+    reporter = Reporter()
+    t = about_time(range(3))
+    list(t)
+    reporter.watch('a', t)
+    reporter.watch('b', t)
+    reporter.unwatch('a')
+    reporter.unwatch('unknown')
+    assert [s.name for s in reporter.sample()] == ['b']
+
+
+def test_report_prints():
+    file = io.StringIO()
+    reporter = Reporter(file=file)
+    t = reporter.watch('a', about_time(range(3)))
+    list(t)
+    reporter.report()
+    assert file.getvalue().startswith('a: ') and file.getvalue().endswith(', done\n')
+
+
+def test_report_nothing():
+    file = io.StringIO()
+    Reporter(file=file).report()
+    assert file.getvalue() == ''
+
+
+def test_report_callback_errors():
+    def callback(_samples):
+        raise ValueError('boom')
+
+    reporter = Reporter(callback=callback)
+    list(reporter.watch('a', about_time(range(3))))
+    reporter.report()
+    assert isinstance(reporter.last_error, ValueError)
+
+
+def test_background_thread():
+    received, ready = [], threading.Event()
+
+    def callback(samples):
+        received.append(samples)
+        ready.set()
+
+    with Reporter(interval=.01, callback=callback) as reporter:
+        t = reporter.watch('a', about_time(iter(range(10))))
+        it = iter(t)
+        next(it)
+        assert ready.wait(5.)
+    assert received[-1][0].count == 1  # the last report, on stop.
+    assert all(s[0].name == 'a' for s in received)
+
+
+def test_start_twice_and_stop_without_start():
+    reporter = Reporter(interval=10.)
+    assert reporter.start() is reporter.start()
+    reporter.stop()
+    reporter.stop()
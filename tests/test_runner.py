@@ -0,0 +1,143 @@
+import gc
+from unittest import mock
+
+import pytest
+
+from about_time import Comparison, RepeatStats, compare, repeat
+from about_time.runner import mann_whitney
+
+
+@pytest.fixture
+def fake_clock():
+    """A clock that only advances when the fake function is called."""
+    now = [0]
+    with mock.patch('time.perf_counter_ns', side_effect=lambda: now[0]):
+        yield now
+
+
+def test_repeat_autorange(fake_clock):
+    calls = []
+
+    def func(a, b):
+        calls.append((a, b))
+        fake_clock[0] += 1000  # 1µs per call.
+
+    stats = repeat(func, args=(1,), kwargs=dict(b=2), rounds=3, warmup=2, min_time=.001)
+    assert isinstance(stats, RepeatStats)
+    assert stats.number == 1000
+    assert stats.times == [1e-6] * 3
+    # the warmup, the scaling rounds 1, 2, 5, ..., 500, 1000, and the measured rounds.
+    assert len(calls) == 2 + (1 + 2 + 5 + 10 + 20 + 50 + 100 + 200 + 500 + 1000) + 3 * 1000
+    assert calls[0] == (1, 2)
+
+
+def test_repeat_number(fake_clock):
+    durations = iter([3000, 1000, 2000, 5000, 4000])
+
+    def func():
+        fake_clock[0] += next(durations)
+
+    stats = repeat(func, rounds=5, warmup=0, number=1)
+    assert (stats.min, stats.max, stats.median) == (1e-6, 5e-6, 3e-6)
+    assert stats.mean == pytest.approx(3e-6)
+    assert stats.stdev == pytest.approx(1.5811e-6, rel=1e-4)
+    assert stats.iqr == pytest.approx(2e-6)
+    assert stats.throughput == pytest.approx(1 / 3e-6)
+    assert str(stats) == '5 rounds of 1 calls: 3µs ±1.6µs (min: 1µs, median: 3µs, ' \
+                         'IQR: 2µs) -> 333.3k/s'
+
+
+def test_repeat_single_round(fake_clock):
+    def func():
+        fake_clock[0] += 1000
+
+    stats = repeat(func, rounds=1, number=10)
+    assert (stats.stdev, stats.iqr) == (0., 0.)
+    assert stats.median_human == '1µs'
+
+
+@pytest.mark.parametrize('disable_gc, enabled_during', [(True, False), (False, True)])
+def test_repeat_gc(disable_gc, enabled_during):
+    seen = []
+    repeat(lambda: seen.append(gc.isenabled()), rounds=1, number=1, disable_gc=disable_gc)
+    assert set(seen) == {enabled_during}
+    assert gc.isenabled()
+
+
+def test_repeat_gc_restored_on_error():
+    def func():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        repeat(func)
+    assert gc.isenabled()
+
+
+def test_repeat_real():
+    stats = repeat(sum, args=(range(10),), rounds=2, min_time=.001)
+    assert stats.number >= 1 and stats.min > 0.
+    assert stats.throughput_human.value > 0.
+
+
+@pytest.mark.parametrize('x, y, expected', [
+    ([1, 2, 3, 4, 5, 6, 7, 8], [9, 10, 11, 12, 13, 14, 15, 16], .000939),  # as scipy.
+    ([1, 3, 5, 7, 9], [2, 4, 6, 8, 10], .6761),
+    ([1, 2, 2, 3, 4], [2, 3, 3, 5, 6], .1988),  # with ties.
+    ([1, 1, 1], [1, 1, 1], 1.),
+])
+def test_mann_whitney(x, y, expected):
+    assert mann_whitney(x, y) == pytest.approx(expected, rel=1e-3)
+    assert mann_whitney(y, x) == pytest.approx(expected, rel=1e-3)
+
+
+def test_compare_interleaves(fake_clock):
+    order = []
+
+    def make(name, ns):
+        def func():
+            order.append(name)
+            fake_clock[0] += ns
+
+        return func
+
+    c = compare(make('a', 3000), make('b', 1000), rounds=4, warmup=1, number=2)
+    assert isinstance(c, Comparison)
+    assert order == ['a', 'b'] + ['a', 'a', 'b', 'b', 'b', 'b', 'a', 'a'] * 2
+    assert (c.a.times, c.b.times) == ([3e-6] * 4, [1e-6] * 4)
+    assert c.speedup == pytest.approx(3.)
+    assert c.speedup_low == c.speedup_high == pytest.approx(3.)
+
+
+def test_compare_significant(fake_clock):
+    def make(base):
+        state = iter(range(100))
+
+        def func():
+            fake_clock[0] += base + next(state) % 5 * 10
+
+        return func
+
+    c = compare(make(2000), make(1000), rounds=10, warmup=0, number=1, names=('old', 'new'))
+    assert c.significant and c.p_value < .001
+    assert c.speedup_low <= c.speedup <= c.speedup_high
+    assert str(c).startswith('new is 1.9')
+    assert 'x faster than old (95% CI: ' in str(c)
+    assert str(c).endswith('): 2µs -> 1µs')
+
+    c = compare(make(1000), make(2000), rounds=10, warmup=0, number=1)
+    assert c.speedup < 1. and 'b is 1.9' in str(c) and 'x slower than a' in str(c)
+
+
+def test_compare_not_significant(fake_clock):
+    def func():
+        fake_clock[0] += 1000
+
+    c = compare(func, func, rounds=10, number=1)
+    assert not c.significant and c.p_value == 1.
+    assert str(c) == 'no significant difference between a and b (p=1): 1µs -> 1µs'
+
+
+def test_compare_real():
+    c = compare(sum, sum, args=(range(10),), rounds=4, min_time=.001)
+    assert c.a.number >= 1 and c.b.number >= 1
+    assert 0. <= c.p_value <= 1.
@@ -0,0 +1,148 @@
+import asyncio
+import math
+import random
+from unittest import mock
+
+import pytest
+
+from about_time import SampledStats, timed
+
+
+def test_timed_keeps_function():
+    @timed
+    def func(a, b=1):
+        """Doc."""
+        return a + b
+
+    assert func(1, b=2) == 3
+    assert func.__name__ == 'func' and func.__doc__ == 'Doc.'
+    assert isinstance(func.stats, SampledStats)
+
+
+def test_timed_every(mock_perf_counter):
+    mock_perf_counter.side_effect = 1., 2., 5., 9.
+
+    @timed(every=3)
+    def func():
+        pass
+
+    for _ in range(7):
+        func()
+
+    s = func.stats
+    assert (s.calls, s.samples) == (7, 2)
+    assert s.mean == pytest.approx(2.5)
+    assert s.total == pytest.approx(17.5)
+    assert s.throughput == pytest.approx(.4)
+    assert s.total_error > 0.
+
+
+def test_timed_every_call_is_exact(mock_perf_counter):
+    mock_perf_counter.side_effect = 1., 2., 3., 5.
+
+    @timed(sample_rate=1.)
+    def func():
+        pass
+
+    func(), func()
+    s = func.stats
+    assert (s.calls, s.samples, s.total, s.total_error) == (2, 2, 3., 0.)
+
+
+def test_timed_sample_rate():
+    @timed(sample_rate=.1)
+    def func():
+        pass
+
+    for _ in range(20000):
+        func()
+
+    s = func.stats
+    assert s.calls == 20000
+    assert 1600 < s.samples < 2400
+
+
+def test_timed_total_error_brackets_true_total(mock_perf_counter):
+    # the clock only advances inside the calls, by a known random duration each.
+    rnd, clock = random.Random(42), [0.]
+    mock_perf_counter.side_effect = lambda: clock[0]
+    covered = 0
+    with mock.patch('random.random', rnd.random):
+        for _ in range(100):
+            @timed(sample_rate=.1)
+            def func():
+                clock[0] += rnd.expovariate(1000.)
+
+            true_total = clock[0]
+            for _ in range(5000):
+                func()
+            true_total, s = clock[0] - true_total, func.stats
+            assert 0. < s.total_error < s.total  # a real margin, not just finite.
+            covered += abs(s.total - true_total) <= s.total_error
+    assert 85 <= covered < 100  # about 95% of the margins contain the true total.
+
+
+def test_timed_exception(mock_perf_counter):
+    mock_perf_counter.side_effect = 1., 3.
+
+    @timed(every=1)
+    def func():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        func()
+    assert (func.stats.calls, func.stats.samples, func.stats.mean) == (1, 1, 2.)
+
+
+def test_timed_not_enough_samples():
+    @timed(every=10)
+    def func():
+        pass
+
+    func()
+    s = func.stats
+    assert (s.calls, s.samples, s.total) == (1, 0, 0.)
+    assert math.isinf(s.total_error)
+    assert s.total_error_human is None
+    assert str(s) == '1 in ~0ns ±? (mean: 0ns, 0 samples) -> 0/d'
+
+
+def test_timed_str(mock_perf_counter):
+    mock_perf_counter.side_effect = 1., 1.5, 2., 2.5
+
+    @timed(every=2)
+    def func():
+        pass
+
+    for _ in range(4):
+        func()
+    assert str(func.stats.unit('x')) == '4x in ~2s ±0ns (mean: 500ms, 2 samples) -> 2x/s'
+
+
+@pytest.mark.parametrize('kwargs', [dict(every=0), dict(sample_rate=0.), dict(sample_rate=2.)])
+def test_timed_invalid(kwargs):
+    with pytest.raises(AssertionError):
+        timed(lambda: None, **kwargs)
+
+
+def test_timed_async(mock_perf_counter):
+    mock_perf_counter.side_effect = 1., 3.
+
+    @timed(every=1)
+    async def func(a):
+        await asyncio.sleep(0)
+        assert mock_perf_counter.call_count == 1  # the timing is still running.
+        return a
+
+    assert asyncio.iscoroutinefunction(func)
+    assert asyncio.run(func(5)) == 5
+    assert (func.stats.calls, func.stats.samples, func.stats.mean) == (1, 1, 2.)
+
+
+def test_timed_async_not_sampled(mock_perf_counter):
+    @timed(every=2)
+    async def func(a):
+        return a
+
+    assert asyncio.run(func(5)) == 5
+    assert (func.stats.calls, func.stats.samples, mock_perf_counter.call_count) == (1, 0, 0)
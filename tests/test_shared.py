@@ -0,0 +1,150 @@
+import builtins
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import pytest
+
+from about_time import about_time
+from about_time.shared import SharedHandle, SharedStats
+
+_shared = None
+
+
+def _init(shared):
+    global _shared
+    _shared = shared
+
+
+def _task(n):
+    _shared.add(about_time(sum, range(n)))
+    t = about_time(range(n))
+    for _ in t:
+        pass
+    _shared.add(t)
+    return n
+
+
+def test_shared_stats_same_process():
+    with SharedStats(slots=2) as shared:
+        shared.record(.5, 10)
+        shared.add(about_time(lambda: 1))
+        t = about_time(range(5))
+        list(t)
+        shared.add(t)
+
+        assert shared.count == 16
+        assert shared.calls == 3
+        assert shared.busy >= .5
+        assert shared.workers == 1
+        shared.stop()
+        h = shared.handle()
+        assert h.count == 16
+        assert h.throughput == pytest.approx(16 / h.duration)
+
+
+def test_shared_stats_slots_exhausted():
+    with SharedStats(slots=1) as shared:
+        shared.record(1.)
+        state = shared.__getstate__()
+        other = SharedStats.__new__(SharedStats)
+        other.__setstate__(state)
+        other._SharedStats__pid = -1  # pretend to be another process.
+        other._SharedStats__data[0] = os.getppid()  # one which is alive.
+        with pytest.raises(RuntimeError):
+            other.record(1.)
+        other.close()
+
+
+def test_shared_stats_dead_slots_are_taken_over():
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+    with SharedStats(slots=1) as shared:
+        shared.record(1., 10)
+        shared._SharedStats__data[0] = dead.pid  # as if it was recorded by that process.
+        shared._SharedStats__pid = None  # and this one is new.
+        shared.record(2., 5)
+        assert (shared.count, shared.calls, shared.busy, shared.workers) == (15, 2, 3., 1)
+
+
+def test_shared_stats_stop(S):
+    with mock.patch('time.perf_counter_ns') as mt:
+        mt.return_value = S
+        with SharedStats(slots=1) as shared:
+            h = shared.handle()
+            mt.return_value = 3 * S
+            assert h.duration == 2.  # live.
+            mt.return_value = 4 * S
+            assert h.duration == 3.
+            shared.stop()
+            mt.return_value = 10 * S
+            assert h.duration == 3.
+
+
+def test_shared_stats_handle_is_a_view():
+    with SharedStats(slots=1) as shared:
+        shared.record(1., 10)
+        h = shared.handle()
+        assert isinstance(h, SharedHandle)
+        assert (h.count, h.total, h.histogram) == (10, None, None)
+        with pytest.raises(TypeError):
+            iter(h)
+        with pytest.raises(TypeError):
+            aiter(h) if hasattr(builtins, 'aiter') else h.__aiter__()
+
+
+def test_shared_stats_threads():
+    with SharedStats(slots=1) as shared:
+        def work():
+            for _ in range(20000):
+                shared.record(.001, 2)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switches threads a lot, to expose any race.
+        try:
+            threads = [threading.Thread(target=work) for _ in range(8)]
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+        finally:
+            sys.setswitchinterval(interval)
+        assert (shared.count, shared.calls, shared.workers) == (320000, 160000, 1)
+
+
+def test_shared_stats_pickle_requires_spawning():
+    with SharedStats(slots=1) as shared:
+        with pytest.raises(RuntimeError):
+            pickle.dumps(shared)  # the lock can only be sent when starting processes.
+
+
+@pytest.mark.parametrize('method', ['fork', 'spawn'])
+def test_shared_stats_processes(method):
+    if method not in multiprocessing.get_all_start_methods():  # pragma: no cover
+        pytest.skip('{} is not available'.format(method))
+    ctx = multiprocessing.get_context(method)
+    with SharedStats(slots=4, context=ctx) as shared:
+        with ProcessPoolExecutor(2, mp_context=ctx, initializer=_init,
+                                 initargs=(shared,)) as ex:
+            assert sum(ex.map(_task, range(1, 11))) == 55
+
+        assert shared.count == 55 + 10
+        assert shared.calls == 20
+        assert 1 <= shared.workers <= 2
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason='max_tasks_per_child is from 3.11')
+def test_shared_stats_recycled_workers():
+    ctx = multiprocessing.get_context('spawn')
+    with SharedStats(slots=3, context=ctx) as shared:
+        with ProcessPoolExecutor(1, mp_context=ctx, initializer=_init, initargs=(shared,),
+                                 max_tasks_per_child=1) as ex:  # a new process for each task.
+            assert sum(ex.map(_task, range(1, 9))) == 36
+
+        assert (shared.count, shared.calls) == (36 + 8, 16)
+        assert 1 <= shared.workers <= 3
@@ -0,0 +1,147 @@
+import copy
+import io
+import pickle
+import socket
+
+import pytest
+
+from about_time import TimedIO, timed_io
+
+
+def test_read_methods():
+    f = timed_io(io.BytesIO(b'line1\nline2\nrest'))
+    assert f.readline() == b'line1\n'
+    assert f.read(3) == b'lin'
+    assert f.read() == b'e2\nrest'
+    assert f.read() == b''
+    assert (f.bytes_read, f.bytes_written, f.count, f.calls) == (16, 0, 16, 4)
+
+
+def test_readinto_counts_without_copies():
+    f, buffer = timed_io(io.BytesIO(bytes(10))), bytearray(4)
+    sizes = []
+    while True:
+        n = f.readinto(buffer)
+        if not n:
+            break
+        sizes.append(n)
+    assert sizes == [4, 4, 2]
+    assert f.bytes_read == 10
+
+
+def test_write():
+    raw = io.BytesIO()
+    f = timed_io(raw)
+    assert f.write(b'abc') == 3
+    assert f.write(memoryview(bytes(8)).cast('i')) == 8
+    assert raw.getvalue() == b'abc' + bytes(8)
+    assert (f.bytes_read, f.bytes_written) == (0, 11)
+
+
+def test_iterate_lines():
+    f = timed_io(io.BytesIO(b'a\nb\nc'))
+    assert list(f) == [b'a\n', b'b\n', b'c']
+    assert f.bytes_read == 5
+
+
+def test_delegates_everything_else():
+    raw = io.BytesIO(b'abcdef')
+    f = timed_io(raw)
+    f.seek(2)
+    assert f.tell() == 2 and f.raw is raw
+    assert f.read() == b'cdef'
+    f.close()
+    assert raw.closed and f.closed
+    with pytest.raises(AttributeError):
+        f.unknown
+
+
+@pytest.mark.parametrize('name', ['__getstate__', '__reduce_ex__', '__len__', '__copy__'])
+def test_does_not_delegate_special_names(name):
+    with pytest.raises(AttributeError):
+        timed_io(io.BytesIO()).__getattr__(name)  # what Python < 3.11 does when copying.
+
+
+def test_copy_and_pickle():
+    raw = io.BytesIO(b'abc')
+    f = timed_io(raw)
+    f.read(1)
+    c = copy.copy(f)
+    assert c.raw is raw and (c.bytes_read, c.calls) == (1, 1)
+    p = pickle.loads(pickle.dumps(f))
+    assert p.raw.getvalue() == b'abc' and p.bytes_read == 1 and p.read() == b'bc'
+
+
+def test_exit_closes():
+    raw = io.BytesIO(b'abc')
+    with timed_io(raw) as f:
+        f.read()
+    assert raw.closed and f._end
+
+
+class Failing(object):
+    def __init__(self, mock_timer, timeout_ns):
+        self.mock_timer, self.timeout_ns = mock_timer, timeout_ns
+
+    def recv(self, _size):
+        self.mock_timer.return_value = self.timeout_ns  # blocked until the timeout.
+        raise socket.timeout
+
+    def read(self, _size):
+        raise OSError
+
+    readinto = write = read
+
+
+def test_failed_calls_count_as_io(mock_timer, S):
+    mock_timer.return_value = 0
+    f = timed_io(Failing(mock_timer, 5 * S))
+    with pytest.raises(socket.timeout):
+        f.recv(10)
+    for method, arg in (f.read, 1), (f.readinto, bytearray(1)), (f.write, b'x'):
+        with pytest.raises(OSError):
+            method(arg)
+    assert (f.io_ns, f.calls, f.count, f.other_time) == (5 * S, 4, 0, 0.)
+
+
+def test_socket():
+    a, b = socket.socketpair()
+    with a, b:
+        ta, tb = timed_io(a), timed_io(b)
+        assert ta.send(b'abc') == 3
+        ta.sendall(bytearray(1000))
+        assert tb.recv(3) == b'abc'
+        buffer, n = bytearray(1000), 0
+        while n < 1000:
+            n += tb.recv_into(memoryview(buffer)[n:])
+        assert (ta.bytes_written, tb.bytes_read) == (1003, 1003)
+        assert ta.calls == 2
+
+
+def test_io_and_other_time(mock_timer, S):
+    # wrap, read start/end, write start/end, exit.
+    mock_timer.side_effect = [0, 1 * S, 2 * S, 5 * S, 6 * S, 8 * S]
+    with timed_io(io.BytesIO(bytes(4096))) as f:
+        f.read(2048)
+        f.write(bytes(2048))
+    assert f.duration == 8.
+    assert (f.io_time, f.other_time, f.io_ratio) == (2., 6., .25)
+    assert f.throughput == 512. and f.io_throughput == 2048.
+    assert f.count_bytes_human == '4KiB'
+    assert f.throughput_bytes_human == '512B/s'
+    assert f.io_throughput_bytes_human == '2KiB/s'
+    assert str(f) == '4KiB in 2 calls, io: 2s (25%), other: 6s -> 512B/s (io: 2KiB/s)'
+
+
+def test_close_stops_clock(mock_timer, S):
+    mock_timer.side_effect = [0, 3 * S]
+    f = timed_io(io.BytesIO())
+    f.close()
+    assert f.duration == 3.
+    assert (f.io_time, f.io_ratio, f.throughput, f.io_throughput) == (0., 0., 0., 0.)
+
+
+def test_is_a_handle():
+    f = timed_io(io.BytesIO())
+    assert isinstance(f, TimedIO)
+    assert f.duration_ns >= 0
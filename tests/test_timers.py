@@ -0,0 +1,161 @@
+import asyncio
+import threading
+
+import pytest
+
+from about_time import Timer, report_timers, timer
+from about_time.timers import timers
+
+
+def test_timer_registry():
+    t = timer('test.registry')
+    assert isinstance(t, Timer)
+    assert t.name == 'test.registry'
+    assert timer('test.registry') is t
+    assert timers()['test.registry'] is t
+
+
+def test_timer_empty():
+    s = timer('test.empty').stats()
+    assert (s.count, s.total, s.min, s.max, s.mean, s.throughput) == (0, 0., 0., 0., 0., 0.)
+
+
+def test_timer_context_manager(mock_timer, S):
+    mock_timer.side_effect = S, 3 * S // 2, 2 * S, 4 * S, 10 * S, 11 * S
+    t = timer('test.context')
+    for _ in range(3):
+        with t:
+            pass
+
+    s = t.stats()
+    assert s.count == 3
+    assert s.total == pytest.approx(3.5)
+    assert s.min == pytest.approx(.5)
+    assert s.max == pytest.approx(2.)
+    assert s.mean == pytest.approx(3.5 / 3)
+    assert s.throughput == pytest.approx(3 / 3.5)
+
+
+def test_timer_nested(mock_timer, S):
+    mock_timer.side_effect = S, 2 * S, 3 * S, 5 * S
+    t = timer('test.nested')
+    with t:
+        with t:
+            pass
+
+    s = t.stats()
+    assert s.count == 2
+    assert (s.min, s.max) == (1., 4.)
+
+
+def test_timer_decorator(mock_timer, S):
+    mock_timer.side_effect = S, 3 * S
+
+    @timer('test.decorator')
+    def add(a, b):
+        return a + b
+
+    assert add(1, b=2) == 3
+    assert add.__name__ == 'add'
+    assert timer('test.decorator').stats().total == 2.
+
+
+def test_timer_decorator_async(mock_timer, S):
+    mock_timer.side_effect = S, 3 * S
+
+    @timer('test.decorator.async')
+    async def add(a, b):
+        await asyncio.sleep(0)
+        assert mock_timer.call_count == 1  # the timing is still running.
+        return a + b
+
+    assert asyncio.run(add(1, b=2)) == 3
+    assert add.__name__ == 'add'
+    assert timer('test.decorator.async').stats().total == 2.  # the awaiting, not the creation.
+
+
+def test_timer_concurrent_tasks(mock_timer, S):
+    mock_timer.side_effect = S, 2 * S, 10 * S, 12 * S
+    t = timer('test.tasks')
+
+    async def first(entered, second_entered):
+        with t:
+            entered.set()
+            await second_entered.wait()  # exits while the second block is still open.
+
+    async def second(entered, second_entered):
+        await entered.wait()
+        with t:
+            second_entered.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+    async def main():
+        events = asyncio.Event(), asyncio.Event()
+        await asyncio.gather(first(*events), second(*events))
+
+    asyncio.run(main())
+    s = t.stats()
+    assert (s.count, s.min, s.max) == (2, 9., 10.)
+
+
+def test_timer_record():
+    t = timer('test.record')
+    t.record(.25)
+    t.record(.75)
+    s = t.stats()
+    assert (s.count, s.total, s.min, s.max) == (2, 1., .25, .75)
+
+
+def test_timer_threads():
+    t = timer('test.threads')
+
+    def work():
+        for _ in range(1000):
+            t.record(.001)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    s = t.stats()
+    assert s.count == 8000
+    assert s.total == pytest.approx(8.)
+
+
+def test_timer_threads_that_end():
+    t = timer('test.threads.end')
+    t.record(1.)
+    for _ in range(50):
+        th = threading.Thread(target=t.record, args=(.5,))
+        th.start()
+        th.join()
+
+    assert len(t._Timer__shards) == 1  # only the one of this thread is still there.
+    s = t.stats()
+    assert (s.count, s.total, s.min, s.max) == (51, 26., .5, 1.)
+
+
+def test_timer_stats_human():
+    t = timer('test.human')
+    t.record(.002)
+    t.record(.004)
+    s = t.stats().unit('q')
+    assert s.count_human == '2q'
+    assert s.total_human == '6ms'
+    assert s.mean_human == '3ms'
+    assert s.min_human == '2ms'
+    assert s.max_human == '4ms'
+    assert s.throughput_human == '333.3q/s'
+    assert str(s) == 'test.human: 2q in 6ms (mean: 3ms, min: 2ms, max: 4ms) -> 333.3q/s'
+
+
+def test_report_timers():
+    timer('test.report.b').record(1.)
+    timer('test.report.a').record(2.)
+    lines = report_timers().splitlines()
+    a = lines.index('test.report.a: 1 in 2s (mean: 2s, min: 2s, max: 2s) -> 30/m')
+    b = lines.index('test.report.b: 1 in 1s (mean: 1s, min: 1s, max: 1s) -> 1/s')
+    assert a < b
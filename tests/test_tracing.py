@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+import pytest
+
+from about_time import SpanStats, collapsed_spans, report_spans, reset_spans, span, spans
+
+
+@pytest.fixture(autouse=True)
+def fresh_spans():
+    reset_spans()
+    yield
+    reset_spans()
+
+
+def test_span_handle(mock_timer, S):
+    mock_timer.side_effect = S, 3 * S
+    with span('a') as t:
+        pass
+    assert (t.name, t.duration) == ('a', 2.)
+    assert t.duration_human == '2s'
+
+
+def test_span_tree(mock_timer, S):
+    # request(0-10) > db(1-3), render(4-9) > db(5-6); request(20-21)
+    mock_timer.side_effect = [x * S for x in (0, 1, 3, 4, 5, 6, 9, 10, 20, 21)]
+    with span('request'):
+        with span('db'):
+            pass
+        with span('render'):
+            with span('db'):
+                pass
+    with span('request'):
+        pass
+
+    request = spans().children['request']
+    assert isinstance(request, SpanStats)
+    assert (request.count, request.total_ns, request.self_ns) == (2, 11 * S, 4 * S)
+    assert request.total == 11. and request.self_time == 4.
+    db, render = request.children['db'], request.children['render']
+    assert (db.count, db.total_ns, db.self_ns) == (1, 2 * S, 2 * S)
+    assert (render.count, render.total_ns, render.self_ns) == (1, 5 * S, 4 * S)
+    assert render.children['db'].total_ns == S
+
+    assert report_spans() == '\n'.join([
+        'request: 2 in 11s (self: 4s)',
+        '  db: 1 in 2s (self: 2s)',
+        '  render: 1 in 5s (self: 4s)',
+        '    db: 1 in 1s (self: 1s)',
+    ])
+    assert collapsed_spans() == '\n'.join([
+        'request {}'.format(4 * S),
+        'request;db {}'.format(2 * S),
+        'request;render {}'.format(4 * S),
+        'request;render;db {}'.format(S),
+    ])
+
+
+def test_span_exception():
+    with pytest.raises(ValueError):
+        with span('a'):
+            with span('b'):
+                raise ValueError
+    assert spans().children['a'].children['b'].count == 1
+    with span('c'):
+        pass
+    assert set(spans().children) == {'a', 'c'}  # the active span was restored.
+
+
+def test_span_threads():
+    def work():
+        with span('thread'):
+            with span('work'):
+                pass
+
+    with span('main'):
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    root = spans().children
+    assert root['thread'].count == 4  # threads do not inherit the active span.
+    assert root['thread'].children['work'].count == 4
+    assert root['main'].self_ns == root['main'].total_ns
+
+
+def test_span_async_tasks():
+    async def task():
+        async with span('task'):
+            await asyncio.sleep(.01)
+
+    async def main():
+        async with span('main'):
+            await asyncio.gather(task(), task(), task())
+
+    asyncio.run(main())
+    main_stats = spans().children['main']
+    assert main_stats.children['task'].count == 3  # tasks inherit the active span.
+    assert main_stats.self_ns == 0  # the concurrent tasks overlap their parent.
+
+
+def test_reset_spans():
+    with span('a'):
+        pass
+    reset_spans()
+    assert spans().children == {}
+    assert report_spans() == collapsed_spans() == ''
+
+
+@pytest.mark.parametrize('name', ['', 'a;b', 'a b', 'a\tb', 'a\n'])
+def test_span_invalid_name(name):
+    with pytest.raises(ValueError):
+        span(name)